@@ -0,0 +1,276 @@
+"""Regional catalog shards and query routing."""
+
+import logging
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from .services import GroceryService, RecipeService, UserPreferences
+from .utils import normalize_search_text
+
+logger = logging.getLogger(__name__)
+
+ShardKey = Tuple[str, str]
+ShardLoader = Callable[[str, str], Tuple[List[Dict], List[Dict]]]
+
+
+def partition_recipes(recipes: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Partition recipes by normalized cuisine.
+
+    Args:
+        recipes: Recipe dictionaries for one region
+
+    Returns:
+        Mapping of normalized cuisine to the recipes of that cuisine
+    """
+    partitions: Dict[str, List[Dict]] = {}
+    for recipe in recipes:
+        cuisine = normalize_search_text(recipe.get("cuisine", ""))
+        partitions.setdefault(cuisine, []).append(recipe)
+    return partitions
+
+
+class CatalogShard:
+    """A region and cuisine partition of the recipe catalog."""
+
+    def __init__(self, region: str, cuisine: str, recipes: List[Dict]):
+        """
+        Build the recipe service for one shard.
+
+        Args:
+            region: Region or tenant the shard belongs to
+            cuisine: Normalized cuisine of every recipe in the shard
+            recipes: Recipe catalog of the shard
+        """
+        self.region = region
+        self.cuisine = cuisine
+        self.recipe_service = RecipeService(recipes)
+
+
+class RegionCatalog(NamedTuple):
+    """Catalog state of one region, replaced as a whole rather than mutated."""
+    grocery_service: GroceryService
+    shards: Mapping[str, CatalogShard]
+
+
+class ShardedCatalog:
+    """
+    Catalog partitioned by region and cuisine with query routing.
+
+    Queries only touch the shards of the requested region whose cuisine matches the
+    user's preferred cuisines, so scan size follows the tenant's catalog rather than
+    the global one. Shards are loaded, reloaded and unloaded independently, while all
+    shards of a region share one grocery catalog.
+
+    Region state is copy-on-write: writers build a new mapping under a lock and
+    publish it with a single assignment, so readers never see a mapping that is
+    being changed.
+    """
+
+    def __init__(self, loader: Optional[ShardLoader] = None):
+        """
+        Initialize an empty sharded catalog.
+
+        Args:
+            loader: Returns the (recipes, grocery_items) for a (region, cuisine) shard
+        """
+        self.logger = logging.getLogger(__name__)
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._regions: Mapping[str, RegionCatalog] = MappingProxyType({})
+
+    def add_shard(self, region: str, cuisine: str, recipes: List[Dict],
+                  grocery_items: Optional[List[Dict]] = None) -> CatalogShard:
+        """
+        Build a shard from in-memory catalogs, replacing any existing one.
+
+        Args:
+            region: Region or tenant of the shard
+            cuisine: Cuisine of the shard
+            recipes: Recipe catalog of the shard
+            grocery_items: Grocery catalog of the whole region, or None to keep the
+                region's current one
+
+        Returns:
+            The added or reloaded shard
+
+        Raises:
+            ValueError: If a recipe's cuisine differs from the shard's
+        """
+        cuisine = normalize_search_text(cuisine)
+        # Routing and lookups rely on every recipe matching its shard's cuisine
+        mismatched = [recipe.get("name") for recipe in recipes
+                      if normalize_search_text(recipe.get("cuisine", "")) != cuisine]
+        if mismatched:
+            raise ValueError(f"Recipes do not belong to cuisine shard "
+                             f"{region}/{cuisine}: {mismatched}")
+        # Build everything before publishing, so a reload swaps the shard and the
+        # region's grocery catalog together while in-flight queries keep the old ones
+        shard = CatalogShard(region, cuisine, recipes)
+        grocery_service = None
+        if grocery_items is not None:
+            grocery_service = self._grocery_service(region, grocery_items)
+        with self._lock:
+            state = self._regions.get(region)
+            if grocery_service is None:
+                grocery_service = (state.grocery_service if state is not None
+                                   else self._grocery_service(region, []))
+            shards = dict(state.shards) if state is not None else {}
+            shards[cuisine] = shard
+            state = RegionCatalog(grocery_service, MappingProxyType(shards))
+            self._publish(region, state)
+        self.logger.info("Loaded shard %s/%s with %d recipes",
+                         region, cuisine, len(shard.recipe_service.recipes))
+        return shard
+
+    def add_region(self, region: str, recipes: List[Dict],
+                   grocery_items: List[Dict]) -> None:
+        """
+        Replace a region's catalog with one shard per cuisine of its recipes.
+
+        Shards of cuisines no longer present in the recipes are unloaded.
+
+        Args:
+            region: Region or tenant
+            recipes: Recipe catalog of the region
+            grocery_items: Grocery catalog of the region, shared by its shards
+        """
+        shards = {cuisine: CatalogShard(region, cuisine, partition)
+                  for cuisine, partition in partition_recipes(recipes).items()}
+        state = RegionCatalog(self._grocery_service(region, grocery_items),
+                              MappingProxyType(shards))
+        with self._lock:
+            self._publish(region, state)
+        self.logger.info("Loaded region %s with %d cuisine shards", region, len(shards))
+
+    def load_shard(self, region: str, cuisine: str) -> CatalogShard:
+        """
+        Load or reload a shard through the configured loader.
+
+        Args:
+            region: Region or tenant of the shard
+            cuisine: Cuisine of the shard
+
+        Returns:
+            The loaded shard
+
+        Raises:
+            ValueError: If no loader is configured or it returns recipes of another
+                cuisine
+        """
+        if self.loader is None:
+            raise ValueError("No shard loader configured")
+        recipes, grocery_items = self.loader(region, cuisine)
+        return self.add_shard(region, cuisine, recipes, grocery_items)
+
+    def unload_shard(self, region: str, cuisine: str) -> None:
+        """
+        Drop a shard so its catalog can be freed.
+
+        Args:
+            region: Region or tenant of the shard
+            cuisine: Cuisine of the shard
+        """
+        cuisine = normalize_search_text(cuisine)
+        with self._lock:
+            state = self._regions.get(region)
+            if state is None or cuisine not in state.shards:
+                return
+            shards = {key: shard for key, shard in state.shards.items()
+                      if key != cuisine}
+            if shards:
+                state = state._replace(shards=MappingProxyType(shards))
+            else:
+                state = None
+            self._publish(region, state)
+
+    def shard_keys(self) -> List[ShardKey]:
+        """Return the (region, cuisine) keys of all loaded shards."""
+        return [(region, cuisine) for region, state in self._regions.items()
+                for cuisine in state.shards]
+
+    def route(self, region: str, preferences: UserPreferences) -> List[CatalogShard]:
+        """
+        Return the shards a recipe query for a region must scan.
+
+        Uses the same substring rule as RecipeService, so a shard is skipped exactly
+        when none of its recipes could pass the cuisine check.
+
+        Args:
+            region: Region or tenant of the user
+            preferences: UserPreferences of the user
+
+        Returns:
+            The shards to query
+        """
+        state = self._regions.get(region)
+        if state is None:
+            return []
+        preferred_cuisines = preferences.preferred_cuisines
+        return [shard for cuisine, shard in state.shards.items()
+                if any(preferred in cuisine for preferred in preferred_cuisines)]
+
+    def find_matching_recipes(self, region: str,
+                              preferences: UserPreferences) -> List[Dict]:
+        """
+        Find recipes matching user preferences within a region.
+
+        Args:
+            region: Region or tenant of the user
+            preferences: UserPreferences object containing dietary restrictions and
+                preferences
+
+        Returns:
+            List of matching recipes from the routed shards
+        """
+        matching_recipes = []
+        for shard in self.route(region, preferences):
+            recipes = shard.recipe_service.find_matching_recipes(preferences)
+            matching_recipes.extend(recipes)
+        return matching_recipes
+
+    def generate_grocery_list(self, region: str, recipes: List[Dict]) -> List[Dict]:
+        """
+        Generate a grocery list from the region's grocery catalog.
+
+        Args:
+            region: Region or tenant of the user
+            recipes: List of recipe dictionaries
+
+        Returns:
+            List of grocery items needed for the recipes
+        """
+        state = self._regions.get(region)
+        if state is None:
+            self.logger.warning("No catalog for region %s", region)
+            return []
+        return state.grocery_service.generate_grocery_list(recipes)
+
+    def _grocery_service(self, region: str,
+                         grocery_items: List[Dict]) -> GroceryService:
+        """Build a region's grocery service, resolving recipes through its shards."""
+        def lookup(recipe: Mapping) -> Optional[Mapping]:
+            return self._lookup_recipe(region, recipe)
+
+        return GroceryService(grocery_items, recipe_lookup=lookup)
+
+    def _lookup_recipe(self, region: str, recipe: Mapping) -> Optional[Mapping]:
+        """Return the current shard record for a recipe of a region, if any."""
+        state = self._regions.get(region)
+        if state is None:
+            return None
+        for shard in state.shards.values():
+            record = shard.recipe_service.lookup(recipe)
+            if record is not None:
+                return record
+        return None
+
+    def _publish(self, region: str, state: Optional[RegionCatalog]) -> None:
+        """Swap in a new region state; the caller must hold the writer lock."""
+        regions = dict(self._regions)
+        if state is None:
+            regions.pop(region, None)
+        else:
+            regions[region] = state
+        self._regions = MappingProxyType(regions)
@@ -17,6 +17,12 @@ DATA_DIR = BASE_DIR / "data"
 API_TIMEOUT = int(os.getenv("API_TIMEOUT", "30"))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100"))
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+SNAPSHOT_HISTORY = int(os.getenv("SNAPSHOT_HISTORY", "2"))
+
+# Grocery store price tables
+PRICE_CACHE_TTL = int(os.getenv("PRICE_CACHE_TTL", "3600"))
+PRICE_CACHE_DIR = DATA_DIR / "price_tables"
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
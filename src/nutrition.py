@@ -0,0 +1,240 @@
+"""Vectorized nutrient aggregation for meal plans."""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import MealPlan
+
+logger = logging.getLogger(__name__)
+
+CALORIES_COLUMN = "calories"
+NUTRIENT_COLUMNS = ("protein", "fat", "carbohydrates", "fiber", "sugar", "sodium")
+
+
+class NutrientAggregator:
+    """
+    Aggregate meal calories and nutrients across many meal plans at once.
+
+    Meals are laid out as a dense matrix with one row per meal and a fixed column
+    order (calories first, then the configured nutrients), so totals, averages and
+    target deviations are computed with NumPy/pandas operations instead of nested
+    dict loops.
+
+    Attributes:
+        nutrients (Tuple[str, ...]): Nutrient names in column order.
+        columns (Tuple[str, ...]): All matrix columns, calories first.
+    """
+
+    def __init__(self, nutrients: Sequence[str] = NUTRIENT_COLUMNS):
+        """
+        Initialize the aggregator with a fixed nutrient column order.
+
+        Args:
+            nutrients (Sequence[str]): Nutrient names to aggregate, in column order.
+        """
+        self.nutrients = tuple(nutrients)
+        self.columns = (CALORIES_COLUMN,) + self.nutrients
+
+    @classmethod
+    def from_plans(cls, plans: Sequence[MealPlan]) -> "NutrientAggregator":
+        """
+        Build an aggregator covering every nutrient recorded in the given plans.
+
+        Args:
+            plans (Sequence[MealPlan]): The meal plans to be aggregated.
+
+        Returns:
+            NutrientAggregator: Default nutrients first, then any others sorted by name.
+        """
+        recorded = set().union(*(_plan_nutrients(plan) for plan in plans))
+        extra = recorded.difference(NUTRIENT_COLUMNS)
+        return cls(NUTRIENT_COLUMNS + tuple(sorted(extra)))
+
+    def meal_matrix(self, plans: Sequence[MealPlan]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lay out all meals of the given plans as a dense matrix.
+
+        Missing calories and nutrients are treated as zero; nutrients outside the
+        configured columns are logged and left out.
+
+        Args:
+            plans (Sequence[MealPlan]): The meal plans to lay out.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The (meals x columns) float matrix and the
+            index of the owning plan for each meal row.
+        """
+        nutrients = self.nutrients
+        rows = []
+        plan_ids = []
+        seen: Set[str] = set()
+        for plan_id, plan in enumerate(plans):
+            for meal in plan.meals:
+                values = meal.nutrients
+                seen.update(values)
+                rows.append([meal.calories or 0.0]
+                            + [values.get(name, 0.0) for name in nutrients])
+                plan_ids.append(plan_id)
+        unknown = seen.difference(nutrients)
+        if unknown:
+            logger.warning("Ignoring nutrients outside the aggregated columns: %s",
+                           sorted(unknown))
+        matrix = np.array(rows, dtype=np.float64).reshape(len(rows), len(self.columns))
+        return matrix, np.array(plan_ids, dtype=np.intp)
+
+    def plan_totals(self, plans: Sequence[MealPlan]) -> np.ndarray:
+        """
+        Compute calorie and nutrient totals for each plan.
+
+        Args:
+            plans (Sequence[MealPlan]): The meal plans to total.
+
+        Returns:
+            np.ndarray: A (plans x columns) matrix of totals in column order.
+        """
+        matrix, plan_ids = self.meal_matrix(plans)
+        totals = np.empty((len(plans), len(self.columns)), dtype=np.float64)
+        for column in range(len(self.columns)):
+            totals[:, column] = np.bincount(plan_ids, weights=matrix[:, column],
+                                            minlength=len(plans))
+        return totals
+
+    def fill_plans(self, plans: Sequence[MealPlan]) -> np.ndarray:
+        """
+        Populate total_calories and nutrients on each plan in bulk.
+
+        Each plan's nutrients only list the nutrients recorded by its meals.
+
+        Args:
+            plans (Sequence[MealPlan]): The meal plans to update in place.
+
+        Returns:
+            np.ndarray: The (plans x columns) matrix of totals that was applied.
+
+        Raises:
+            ValueError: If a meal records a nutrient outside the aggregated columns, as
+                its plan total would be incomplete.
+        """
+        present = [_plan_nutrients(plan) for plan in plans]
+        unknown = set().union(*present).difference(self.nutrients)
+        if unknown:
+            raise ValueError(f"Meals record nutrients outside the aggregated columns: "
+                             f"{sorted(unknown)}")
+        totals = self.plan_totals(plans)
+        calories = np.rint(totals[:, 0]).astype(np.int64).tolist()
+        rows = zip(plans, present, calories, totals[:, 1:].tolist())
+        for plan, names, plan_calories, row in rows:
+            plan.total_calories = plan_calories
+            plan.nutrients = {name: value for name, value in zip(self.nutrients, row)
+                              if name in names}
+        logger.info("Filled nutrient totals for %d meal plans", len(plans))
+        return totals
+
+    def to_frame(self, plans: Sequence[MealPlan],
+                 user_ids: Optional[Sequence[str]] = None,
+                 totals: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Build a per-plan totals frame suitable for date and user roll-ups.
+
+        Args:
+            plans (Sequence[MealPlan]): The meal plans to total.
+            user_ids (Optional[Sequence[str]]): Owner of each plan, parallel to plans.
+            totals (Optional[np.ndarray]): Precomputed plan_totals, to avoid
+                recomputing.
+
+        Returns:
+            pd.DataFrame: One row per plan with date, user_id and one column per total.
+
+        Raises:
+            ValueError: If user_ids does not match the number of plans or a date is
+                invalid.
+        """
+        if user_ids is not None and len(user_ids) != len(plans):
+            raise ValueError("user_ids must have one entry per meal plan")
+        if totals is None:
+            totals = self.plan_totals(plans)
+        frame = pd.DataFrame(totals, columns=list(self.columns))
+        frame.insert(0, "date", pd.to_datetime([plan.date for plan in plans]))
+        frame.insert(1, "user_id", list(user_ids) if user_ids is not None else None)
+        return frame
+
+    def rollup(self, frame: pd.DataFrame, freq: str = "D",
+               by_user: Optional[bool] = None, how: str = "sum") -> pd.DataFrame:
+        """
+        Roll per-plan totals up into periods such as days or weeks.
+
+        Args:
+            frame (pd.DataFrame): A frame produced by to_frame.
+            freq (str): pandas offset alias for the period, e.g. "D" or "W".
+            by_user (Optional[bool]): Whether to keep a separate row per user;
+                defaults to whether the frame has any user ids. Plans without a user
+                id are then kept under a null user_id rather than dropped.
+            how (str): Aggregation to apply, "sum" or "mean".
+
+        Returns:
+            pd.DataFrame: Aggregated totals indexed by (user_id,) date period.
+
+        Raises:
+            ValueError: If how is not a supported aggregation, or by_user is set but the
+                frame has no user ids.
+        """
+        if how not in ("sum", "mean"):
+            raise ValueError(f"Unsupported aggregation: {how}")
+        has_users = bool(frame["user_id"].notna().any())
+        if by_user is None:
+            by_user = has_users
+        elif by_user and not has_users:
+            raise ValueError("Cannot roll up by user: frame has no user ids")
+        keys = [pd.Grouper(key="date", freq=freq)]
+        if by_user:
+            keys.insert(0, "user_id")
+        return frame.groupby(keys, dropna=False)[list(self.columns)].agg(how)
+
+    def target_deviation(self, totals: pd.DataFrame,
+                         targets: Dict[str, float]) -> pd.DataFrame:
+        """
+        Compute the deviation of totals from per-column targets.
+
+        Args:
+            totals (pd.DataFrame): Totals from to_frame or rollup.
+            targets (Dict[str, float]): Target value per column, e.g.
+                {"calories": 2000}.
+
+        Returns:
+            pd.DataFrame: totals minus target for each targeted column.
+
+        Raises:
+            ValueError: If a target names an unknown column.
+        """
+        unknown = [name for name in targets if name not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown nutrient columns: {unknown}")
+        names = [name for name in self.columns if name in targets]
+        return totals[names] - pd.Series(targets)[names]
+
+
+def summarize_plans(plans: List[MealPlan], user_ids: Optional[Sequence[str]] = None,
+                    freq: str = "W") -> pd.DataFrame:
+    """
+    Fill plan totals and return per-user roll-ups for the given period.
+
+    Args:
+        plans (List[MealPlan]): The meal plans to summarize.
+        user_ids (Optional[Sequence[str]]): Owner of each plan, parallel to plans.
+        freq (str): pandas offset alias for the period, e.g. "D" or "W".
+
+    Returns:
+        pd.DataFrame: Summed totals per user and period.
+    """
+    aggregator = NutrientAggregator.from_plans(plans)
+    totals = aggregator.fill_plans(plans)
+    frame = aggregator.to_frame(plans, user_ids, totals=totals)
+    return aggregator.rollup(frame, freq=freq)
+
+
+def _plan_nutrients(plan: MealPlan) -> Set[str]:
+    """Return the names of the nutrients recorded by a plan's meals."""
+    return set().union(*(meal.nutrients for meal in plan.meals))
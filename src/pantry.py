@@ -0,0 +1,207 @@
+"""Household pantry inventory and incremental grocery list syncing."""
+
+import logging
+from typing import Dict, Iterable, List, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+from .models import GroceryItem
+from .utils import normalize_search_text
+
+logger = logging.getLogger(__name__)
+
+ItemKey = Tuple[str, str]
+GroceryLines = Iterable[Union[GroceryItem, Dict]]
+
+
+class GroceryDelta(BaseModel):
+    """Model representing the changes between two synced grocery lists."""
+    added: List[GroceryItem] = Field(default=[])
+    removed: List[GroceryItem] = Field(default=[])
+    changed: List[GroceryItem] = Field(default=[])
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the delta carries no changes."""
+        return not (self.added or self.removed or self.changed)
+
+
+def item_key(name: str, unit: str) -> ItemKey:
+    """
+    Return the index key for an item name and unit.
+
+    Args:
+        name (str): The item name.
+        unit (str): The item unit.
+
+    Returns:
+        ItemKey: The normalized (name, unit) key.
+    """
+    return normalize_search_text(name), normalize_search_text(unit)
+
+
+def to_grocery_items(grocery_list: GroceryLines) -> List[GroceryItem]:
+    """
+    Convert lines from either grocery list generator into merged GroceryItems.
+
+    GroceryService lines describe one pack (e.g. "500g"), so they become one unit of
+    that pack size.
+
+    Args:
+        grocery_list (Iterable[Union[GroceryItem, Dict]]): The grocery list lines.
+
+    Returns:
+        List[GroceryItem]: One item per (name, unit) with quantities summed.
+    """
+    merged: Dict[ItemKey, GroceryItem] = {}
+    for line in grocery_list:
+        if not isinstance(line, GroceryItem):
+            line = GroceryItem(name=line["item"], quantity=1.0,
+                               unit=line.get("quantity", "unit"),
+                               category=line.get("category", "unknown"))
+        key = item_key(line.name, line.unit)
+        if key in merged:
+            merged[key].quantity += line.quantity
+        else:
+            merged[key] = line.copy()
+    return list(merged.values())
+
+
+class PantryStore:
+    """In-memory pantry inventory per household, indexed by (item, unit)."""
+
+    def __init__(self):
+        """Initialize an empty pantry store."""
+        self._inventory: Dict[str, Dict[ItemKey, float]] = {}
+
+    def set_stock(self, household_id: str, name: str, quantity: float,
+                  unit: str = "unit") -> None:
+        """
+        Record how much of an item a household has.
+
+        Args:
+            household_id (str): The household.
+            name (str): The item name.
+            quantity (float): The quantity on hand; zero removes the item.
+            unit (str): The unit the quantity is expressed in.
+
+        Raises:
+            ValueError: If the quantity is negative.
+        """
+        if quantity < 0:
+            raise ValueError("Pantry quantity must not be negative")
+        stock = self._inventory.setdefault(household_id, {})
+        key = item_key(name, unit)
+        if quantity:
+            stock[key] = quantity
+        else:
+            stock.pop(key, None)
+
+    def quantity(self, household_id: str, name: str, unit: str = "unit") -> float:
+        """
+        Return how much of an item a household has.
+
+        Args:
+            household_id (str): The household.
+            name (str): The item name.
+            unit (str): The unit to look up.
+
+        Returns:
+            float: The quantity on hand, zero if none.
+        """
+        return self._inventory.get(household_id, {}).get(item_key(name, unit), 0.0)
+
+    def needs(self, household_id: str, grocery_list: GroceryLines) -> List[GroceryItem]:
+        """
+        Return the grocery list minus what the household already has.
+
+        Args:
+            household_id (str): The household.
+            grocery_list (Iterable[Union[GroceryItem, Dict]]): Lines from either grocery
+                list generator.
+
+        Returns:
+            List[GroceryItem]: Items still to buy, with reduced quantities.
+        """
+        stock = self._inventory.get(household_id, {})
+        needed = []
+        for item in to_grocery_items(grocery_list):
+            missing = item.quantity - stock.get(item_key(item.name, item.unit), 0.0)
+            if missing > 0:
+                item.quantity = missing
+                needed.append(item)
+        return needed
+
+
+class GrocerySync:
+    """
+    Track the last grocery list synced per household and compute deltas against it.
+
+    Only the delta needs to be sent to the grocery service; call mark_synced once it
+    has been delivered so the next diff is taken against it.
+    """
+
+    def __init__(self, pantry: PantryStore):
+        """
+        Initialize the sync tracker.
+
+        Args:
+            pantry (PantryStore): Inventory subtracted from every plan's needs.
+        """
+        self.pantry = pantry
+        self._synced: Dict[str, Dict[ItemKey, GroceryItem]] = {}
+
+    def diff(self, household_id: str, grocery_list: GroceryLines) -> GroceryDelta:
+        """
+        Compute the delta between a household's needs and its last synced list.
+
+        Args:
+            household_id (str): The household.
+            grocery_list (Iterable[Union[GroceryItem, Dict]]): The full list for the
+                new plan.
+
+        Returns:
+            GroceryDelta: Lines to add, remove or change at the grocery service.
+        """
+        previous = self._synced.get(household_id, {})
+        needed = self.pantry.needs(household_id, grocery_list)
+        current = {item_key(item.name, item.unit): item for item in needed}
+
+        delta = GroceryDelta()
+        for key, item in current.items():
+            old = previous.get(key)
+            if old is None:
+                delta.added.append(item)
+            elif old.quantity != item.quantity:
+                delta.changed.append(item)
+        delta.removed = [item for key, item in previous.items() if key not in current]
+        logger.info("Grocery delta for household %s: %d added, %d removed, %d changed",
+                    household_id, len(delta.added), len(delta.removed),
+                    len(delta.changed))
+        return delta
+
+    def mark_synced(self, household_id: str, delta: GroceryDelta) -> None:
+        """
+        Apply a delivered delta to the household's synced list.
+
+        Args:
+            household_id (str): The household.
+            delta (GroceryDelta): The delta returned by diff and delivered.
+        """
+        synced = self._synced.setdefault(household_id, {})
+        for item in delta.removed:
+            synced.pop(item_key(item.name, item.unit), None)
+        for item in delta.added + delta.changed:
+            synced[item_key(item.name, item.unit)] = item
+
+    def synced_list(self, household_id: str) -> List[GroceryItem]:
+        """
+        Return the grocery list last synced for a household.
+
+        Args:
+            household_id (str): The household.
+
+        Returns:
+            List[GroceryItem]: The synced items.
+        """
+        return list(self._synced.get(household_id, {}).values())
@@ -1,12 +1,27 @@
+import json
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from types import MappingProxyType
 from pydantic import BaseModel, ValidationError
-from typing import List, Dict, Optional
+from typing import (
+    Callable, Iterable, Iterator, List, Dict, Mapping, NamedTuple, Optional, Tuple,
+)
 import uuid
 
+from .constants import RESULT_CACHE_SIZE, SNAPSHOT_HISTORY
+from .utils import normalize_search_text
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 20
+RECIPE_INDEX_FIELDS = frozenset({"normalized_name", "normalized_cuisine"})
+GROCERY_INDEX_FIELDS = frozenset({"normalized_category"})
+
 class DietaryRestriction(BaseModel):
     """Model representing dietary restrictions."""
     restriction: str
@@ -21,13 +36,187 @@ class UserPreferences(BaseModel):
     min_protein: float
     max_fat: float
 
+class CatalogSnapshot(NamedTuple):
+    """Immutable, versioned view of a catalog made of read-only records."""
+    version: int
+    records: Tuple[Mapping, ...]
+    by_key: Mapping
+
+RecipeLookup = Callable[[Mapping], Optional[Mapping]]
+ResultKey = Tuple[int, str]
+
+class VersionedCatalog:
+    """
+    Holder of the current catalog snapshot, swapped atomically on reload.
+    
+    Readers take the snapshot once and keep using it, so in-flight queries finish on
+    the version they started with while a new one is swapped in. The most recent
+    versions are kept so paginated scans can resume on the version they began on.
+    """
+    
+    def __init__(self, records: Iterable[Mapping], key: Optional[str] = None,
+                 history: int = SNAPSHOT_HISTORY):
+        """
+        Initialize with the first catalog version.
+        
+        Args:
+            records: Fully built, read-only catalog records
+            key: Record field to index snapshots by, or None for no index
+            history: Number of recent versions kept for resuming paginated scans
+        """
+        self._lock = threading.Lock()
+        self._key = key
+        self._history_size = max(history, 1)
+        self._snapshot = self._build(1, records)
+        self._history: "OrderedDict[int, CatalogSnapshot]" = OrderedDict()
+        self._history[1] = self._snapshot
+    
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """The current catalog snapshot."""
+        return self._snapshot
+    
+    def get(self, version: int) -> Optional[CatalogSnapshot]:
+        """
+        Return a recent snapshot by version.
+        
+        Args:
+            version: Catalog version to look up
+            
+        Returns:
+            The snapshot, or None if the version is unknown or no longer kept
+        """
+        return self._history.get(version)
+    
+    def swap(self, records: Iterable[Mapping]) -> CatalogSnapshot:
+        """
+        Publish fully built records as the next catalog version.
+        
+        Args:
+            records: Fully built catalog records
+            
+        Returns:
+            The newly published snapshot
+        """
+        records = tuple(records)
+        with self._lock:
+            snapshot = self._build(self._snapshot.version + 1, records)
+            history = self._history.copy()
+            history[snapshot.version] = snapshot
+            while len(history) > self._history_size:
+                history.popitem(last=False)
+            # Publish the history first so the snapshot's version is always resolvable
+            self._history = history
+            self._snapshot = snapshot
+            return snapshot
+    
+    def _build(self, version: int, records: Iterable[Mapping]) -> CatalogSnapshot:
+        """Build a snapshot and its key index."""
+        records = tuple(records)
+        by_key = {}
+        if self._key is not None:
+            by_key = {record[self._key]: record for record in records
+                      if self._key in record}
+        return CatalogSnapshot(version, records, MappingProxyType(by_key))
+
 class RecipeService:
     """Service layer for recipe recommendation logic."""
     
-    def __init__(self):
-        """Initialize recipe service with empty recipe database."""
+    def __init__(self, recipes: Optional[List[Dict]] = None):
+        """
+        Initialize recipe service.
+        
+        Args:
+            recipes: Recipe catalog to serve; defaults to the sample recipes
+        """
         self.logger = logging.getLogger(__name__)
-        self.recipes = self._load_sample_recipes()
+        if recipes is None:
+            recipes = self._load_sample_recipes()
+        records = (self._index_recipe(recipe) for recipe in recipes)
+        self._catalog = VersionedCatalog(records, key="id")
+        self._result_cache: "OrderedDict[ResultKey, List[Mapping]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._reload_executor = ThreadPoolExecutor(max_workers=1,
+                                                   thread_name_prefix="recipe-reload")
+    
+    @property
+    def recipes(self) -> Tuple[Mapping, ...]:
+        """Recipes of the current catalog version."""
+        return self._catalog.snapshot.records
+    
+    @property
+    def version(self) -> int:
+        """Current catalog version."""
+        return self._catalog.snapshot.version
+    
+    def lookup(self, recipe: Mapping) -> Optional[Mapping]:
+        """
+        Return the current snapshot record for a recipe returned by this service.
+        
+        Lets other services reuse the precomputed search fields of recipes whose
+        public copies no longer carry them.
+        
+        Args:
+            recipe: Recipe dictionary, e.g. from find_matching_recipes
+            
+        Returns:
+            The read-only catalog record with the same id and name, or None
+        """
+        record = self._catalog.snapshot.by_key.get(recipe.get("id"))
+        if record is None or record.get("name") != recipe.get("name"):
+            return None
+        return record
+    
+    def reload(self, recipes: List[Dict]) -> int:
+        """
+        Build a new catalog version and swap it in.
+        
+        Queries already running keep their snapshot; cached results of older versions
+        simply stop matching instead of being flushed.
+        
+        Args:
+            recipes: The new recipe catalog
+            
+        Returns:
+            The new catalog version
+        """
+        snapshot = self._catalog.swap([self._index_recipe(recipe)
+                                       for recipe in recipes])
+        self.logger.info("Reloaded recipe catalog version %d with %d recipes",
+                         snapshot.version, len(snapshot.records))
+        return snapshot.version
+    
+    def reload_in_background(self, recipes: List[Dict]) -> "Future[int]":
+        """
+        Build and swap in a new catalog version on a background thread.
+        
+        Args:
+            recipes: The new recipe catalog
+            
+        Returns:
+            Future resolving to the new catalog version
+        """
+        return self._reload_executor.submit(self.reload, recipes)
+    
+    @staticmethod
+    def _index_recipe(recipe: Mapping) -> Mapping:
+        """
+        Build a read-only recipe record with normalized search fields attached.
+        
+        Computed once at load time so matching never re-normalizes strings. The input
+        is copied and wrapped read-only so published snapshots cannot be mutated.
+        
+        Args:
+            recipe: Raw recipe dictionary
+            
+        Returns:
+            A read-only copy of the recipe with normalized_name and normalized_cuisine
+            set
+        """
+        recipe = dict(recipe)
+        recipe["normalized_name"] = normalize_search_text(recipe.get("name", ""))
+        recipe["normalized_cuisine"] = normalize_search_text(recipe.get("cuisine", ""))
+        return MappingProxyType(recipe)
     
     def _load_sample_recipes(self) -> List[Dict]:
         """Load sample recipes for demonstration purposes."""
@@ -37,6 +226,54 @@ class RecipeService:
             {"id": str(uuid.uuid4()), "name": "Quinoa Salad", "cuisine": "Mediterranean", "calories": 350, "protein": 20, "fat": 12}
         ]
     
+    def _scan_matching_recipes(self, preferences: UserPreferences, start: int = 0,
+                               recipes: Optional[Tuple[Mapping, ...]] = None
+                               ) -> Iterator[Tuple[int, Mapping]]:
+        """
+        Lazily scan the catalog for recipes matching user preferences.
+        
+        Args:
+            preferences: UserPreferences object containing dietary restrictions and
+                preferences
+            start: Catalog index to resume the scan from
+            recipes: Snapshot records to scan; defaults to the current version
+            
+        Yields:
+            Tuples of (catalog index, matching recipe)
+        """
+        restrictions = [dr.restriction for dr in preferences.dietary_restrictions]
+        cuisines = preferences.preferred_cuisines
+        if recipes is None:
+            recipes = self.recipes
+        
+        for index in range(start, len(recipes)):
+            recipe = recipes[index]
+            name = recipe["normalized_name"]
+            
+            # Check dietary restrictions
+            if any(restriction in name for restriction in restrictions):
+                continue
+            
+            # Check cuisine preferences
+            if not any(cuisine in recipe["normalized_cuisine"] for cuisine in cuisines):
+                continue
+            
+            # Check meal type
+            if not any(meal in name for meal in preferences.meal_types):
+                continue
+            
+            # Check nutritional constraints
+            if recipe["calories"] > preferences.max_calories:
+                continue
+            
+            if recipe["protein"] < preferences.min_protein:
+                continue
+            
+            if recipe["fat"] > preferences.max_fat:
+                continue
+            
+            yield index, recipe
+    
     def find_matching_recipes(self, preferences: UserPreferences) -> List[Dict]:
         """
         Find recipes matching user preferences.
@@ -49,46 +286,221 @@ class RecipeService:
         """
         try:
             self.logger.info("Finding recipes matching preferences: %s", preferences)
-            matching_recipes = []
-            
-            for recipe in self.recipes:
-                # Check dietary restrictions
-                if any(dr.restriction in recipe.get("name", "").lower() for dr in preferences.dietary_restrictions):
-                    continue
-                
-                # Check cuisine preferences
-                if not any(cuisine in recipe["cuisine"].lower() for cuisine in preferences.preferred_cuisines):
-                    continue
-                
-                # Check meal type
-                if not any(meal in recipe["name"].lower() for meal in preferences.meal_types):
-                    continue
-                
-                # Check nutritional constraints
-                if recipe["calories"] > preferences.max_calories:
-                    continue
-                
-                if recipe["protein"] < preferences.min_protein:
-                    continue
-                
-                if recipe["fat"] > preferences.max_fat:
-                    continue
-                
-                matching_recipes.append(recipe)
-            
-            return matching_recipes
+            snapshot = self._catalog.snapshot
+            key = (snapshot.version, preferences.json())
+            with self._cache_lock:
+                cached = self._result_cache.get(key)
+                if cached is not None:
+                    self._result_cache.move_to_end(key)
+                    return [public_record(recipe, RECIPE_INDEX_FIELDS)
+                            for recipe in cached]
+            
+            matches = self._scan_matching_recipes(preferences, recipes=snapshot.records)
+            matching_recipes = [recipe for _, recipe in matches]
+            with self._cache_lock:
+                # Entries of older versions never match again and age out of the LRU
+                self._result_cache[key] = matching_recipes
+                if len(self._result_cache) > RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+            return [public_record(recipe, RECIPE_INDEX_FIELDS)
+                    for recipe in matching_recipes]
         
         except Exception as e:
             self.logger.error("Error finding recipes: %s", str(e))
             return []
+    
+    def iter_matching_recipes(self, preferences: UserPreferences,
+                              limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Lazily yield recipes matching user preferences.
+        
+        The scan stops as soon as limit matches have been produced.
+        
+        Args:
+            preferences: UserPreferences object containing dietary restrictions and
+                preferences
+            limit: Maximum number of recipes to yield, or None for all
+            
+        Yields:
+            Matching recipes in catalog order
+        """
+        try:
+            matches = self._scan_matching_recipes(preferences)
+            for _, recipe in islice(matches, limit):
+                yield public_record(recipe, RECIPE_INDEX_FIELDS)
+        
+        except Exception as e:
+            self.logger.error("Error finding recipes: %s", str(e))
+    
+    def page_matching_recipes(self, preferences: UserPreferences,
+                              cursor: Optional[str] = None,
+                              limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """
+        Return one page of matching recipes with a cursor for the next page.
+        
+        The cursor carries the catalog version and index the next scan resumes from,
+        so pages never rescan recipes already visited and stay on the version the
+        first page was taken from, even across a reload.
+        
+        Args:
+            preferences: UserPreferences object containing dietary restrictions and
+                preferences
+            cursor: Cursor returned by a previous page, or None for the first page
+            limit: Maximum number of recipes in the page
+            
+        Returns:
+            Dictionary with the page "items" and the "next_cursor" (None when exhausted)
+            
+        Raises:
+            ValueError: If the cursor or limit is invalid, or the cursor's catalog
+                version is no longer available
+        """
+        snapshot, start = self._resolve_cursor(cursor, limit)
+        items = []
+        last_index = None
+        matches = self._scan_matching_recipes(preferences, start, snapshot.records)
+        for last_index, recipe in islice(matches, limit):
+            items.append(public_record(recipe, RECIPE_INDEX_FIELDS))
+        
+        next_cursor = self._next_cursor(snapshot, last_index, len(items), limit)
+        return {"items": items, "next_cursor": next_cursor}
+    
+    def stream_matching_recipes(self, preferences: UserPreferences,
+                                cursor: Optional[str] = None,
+                                limit: int = DEFAULT_PAGE_SIZE) -> Iterator[str]:
+        """
+        Stream one page of matching recipes as NDJSON lines.
+        
+        Each matching recipe is emitted as soon as it is found; the final line carries
+        the next_cursor so clients can request the following page.
+        
+        Args:
+            preferences: UserPreferences object containing dietary restrictions and
+                preferences
+            cursor: Cursor returned by a previous page, or None for the first page
+            limit: Maximum number of recipes in the page
+            
+        Yields:
+            Newline-terminated JSON documents
+            
+        Raises:
+            ValueError: If the cursor or limit is invalid, or the cursor's catalog
+                version is no longer available
+        """
+        snapshot, start = self._resolve_cursor(cursor, limit)
+        return self._stream_page(preferences, snapshot, start, limit)
+    
+    def _stream_page(self, preferences: UserPreferences, snapshot: CatalogSnapshot,
+                     start: int, limit: int) -> Iterator[str]:
+        """Yield NDJSON lines for a validated page request."""
+        count = 0
+        last_index = None
+        matches = self._scan_matching_recipes(preferences, start, snapshot.records)
+        for last_index, recipe in islice(matches, limit):
+            count += 1
+            yield json.dumps(public_record(recipe, RECIPE_INDEX_FIELDS)) + "\n"
+        
+        next_cursor = self._next_cursor(snapshot, last_index, count, limit)
+        yield json.dumps({"next_cursor": next_cursor}) + "\n"
+    
+    def _resolve_cursor(self, cursor: Optional[str],
+                        limit: int) -> Tuple[CatalogSnapshot, int]:
+        """Return the snapshot and index a page request resumes from."""
+        version, start = parse_cursor(cursor)
+        if limit <= 0:
+            raise ValueError("Page limit must be positive")
+        if version is None:
+            return self._catalog.snapshot, start
+        snapshot = self._catalog.get(version)
+        if snapshot is None:
+            raise ValueError(f"Cursor refers to catalog version {version}, "
+                             f"which is no longer available")
+        return snapshot, start
+    
+    @staticmethod
+    def _next_cursor(snapshot: CatalogSnapshot, last_index: Optional[int], count: int,
+                     limit: int) -> Optional[str]:
+        """Return the cursor following a page, or None if the catalog is exhausted."""
+        if count < limit or last_index is None:
+            return None
+        if last_index + 1 >= len(snapshot.records):
+            return None
+        return f"{snapshot.version}:{last_index + 1}"
 
 class GroceryService:
     """Service layer for generating grocery lists."""
     
-    def __init__(self):
-        """Initialize grocery service with empty grocery database."""
+    def __init__(self, grocery_items: Optional[List[Dict]] = None,
+                 recipe_lookup: Optional[RecipeLookup] = None):
+        """
+        Initialize grocery service.
+        
+        Args:
+            grocery_items: Grocery catalog to serve; defaults to the sample items
+            recipe_lookup: Resolves recipes to catalog records carrying precomputed
+                search fields, e.g. RecipeService.lookup
+        """
         self.logger = logging.getLogger(__name__)
-        self.grocery_items = self._load_sample_grocery_items()
+        self.recipe_lookup = recipe_lookup
+        if grocery_items is None:
+            grocery_items = self._load_sample_grocery_items()
+        self._catalog = VersionedCatalog(self._index_grocery_item(item)
+                                         for item in grocery_items)
+        self._reload_executor = ThreadPoolExecutor(max_workers=1,
+                                                   thread_name_prefix="grocery-reload")
+    
+    @property
+    def grocery_items(self) -> Tuple[Mapping, ...]:
+        """Grocery items of the current catalog version."""
+        return self._catalog.snapshot.records
+    
+    @property
+    def version(self) -> int:
+        """Current catalog version."""
+        return self._catalog.snapshot.version
+    
+    def reload(self, grocery_items: List[Dict]) -> int:
+        """
+        Build a new grocery catalog version and swap it in.
+        
+        Args:
+            grocery_items: The new grocery catalog
+            
+        Returns:
+            The new catalog version
+        """
+        snapshot = self._catalog.swap([self._index_grocery_item(item)
+                                       for item in grocery_items])
+        self.logger.info("Reloaded grocery catalog version %d with %d items",
+                         snapshot.version, len(snapshot.records))
+        return snapshot.version
+    
+    def reload_in_background(self, grocery_items: List[Dict]) -> "Future[int]":
+        """
+        Build and swap in a new grocery catalog version on a background thread.
+        
+        Args:
+            grocery_items: The new grocery catalog
+            
+        Returns:
+            Future resolving to the new catalog version
+        """
+        return self._reload_executor.submit(self.reload, grocery_items)
+    
+    @staticmethod
+    def _index_grocery_item(item: Mapping) -> Mapping:
+        """
+        Build a read-only grocery catalog record with normalized search fields attached.
+        
+        Args:
+            item: Raw grocery item dictionary
+            
+        Returns:
+            A read-only copy of the grocery item with normalized_category set
+        """
+        item = dict(item)
+        item["normalized_category"] = normalize_search_text(item.get("category", ""))
+        return MappingProxyType(item)
     
     def _load_sample_grocery_items(self) -> List[Dict]:
         """Load sample grocery items for demonstration purposes."""
@@ -98,6 +510,27 @@ class GroceryService:
             {"item": "Quinoa", "quantity": "500g", "category": "Grains"}
         ]
     
+    def _scan_grocery_items(self, recipes: Iterable[Mapping]) -> Iterator[Mapping]:
+        """Lazily yield catalog grocery items needed for the given recipes."""
+        grocery_items = self.grocery_items
+        for recipe in recipes:
+            name = self._recipe_search_name(recipe)
+            for item in grocery_items:
+                category = item["normalized_category"]
+                if category and category in name:
+                    yield item
+    
+    def _recipe_search_name(self, recipe: Mapping) -> str:
+        """Return a recipe's normalized name, preferring the precomputed field."""
+        name = recipe.get("normalized_name")
+        if name is None and self.recipe_lookup is not None:
+            record = self.recipe_lookup(recipe)
+            if record is not None:
+                name = record["normalized_name"]
+        if name is None:
+            name = normalize_search_text(recipe["name"])
+        return name
+    
     def generate_grocery_list(self, recipes: List[Dict]) -> List[Dict]:
         """
         Generate a grocery list from a list of recipes.
@@ -110,18 +543,67 @@ class GroceryService:
         """
         try:
             self.logger.info("Generating grocery list for %d recipes", len(recipes))
-            grocery_list = []
-            
-            for recipe in recipes:
-                for item in self.grocery_items:
-                    if item["category"] in recipe["name"].lower():
-                        grocery_list.append(item)
-            
-            return grocery_list
+            return [public_record(item, GROCERY_INDEX_FIELDS)
+                    for item in self._scan_grocery_items(recipes)]
         
         except Exception as e:
             self.logger.error("Error generating grocery list: %s", str(e))
             return []
+    
+    def iter_grocery_list(self, recipes: Iterable[Dict],
+                          limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Lazily yield grocery items needed for the given recipes.
+        
+        Recipes may themselves be a generator, e.g. RecipeService.iter_matching_recipes,
+        and are consumed only as far as needed to produce limit items.
+        
+        Args:
+            recipes: Iterable of recipe dictionaries
+            limit: Maximum number of grocery items to yield, or None for all
+            
+        Yields:
+            Grocery items needed for the recipes
+        """
+        try:
+            for item in islice(self._scan_grocery_items(recipes), limit):
+                yield public_record(item, GROCERY_INDEX_FIELDS)
+        
+        except Exception as e:
+            self.logger.error("Error generating grocery list: %s", str(e))
+
+def public_record(record: Mapping, index_fields: frozenset) -> Dict:
+    """
+    Return a copy of a catalog record without its internal search fields.
+    
+    Args:
+        record: Catalog record
+        index_fields: Names of the search fields to drop
+        
+    Returns:
+        The record as exposed to callers
+    """
+    return {key: value for key, value in record.items() if key not in index_fields}
+
+def parse_cursor(cursor: Optional[str]) -> Tuple[Optional[int], int]:
+    """
+    Parse a "<version>:<index>" pagination cursor.
+    
+    Args:
+        cursor: Cursor string returned by a previous page, or None
+        
+    Returns:
+        Catalog version (None for a first page) and index to resume scanning from
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor is None:
+        return None, 0
+    version, _, index = cursor.partition(":")
+    if not (version.isdigit() and index.isdigit()):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return int(version), int(index)
 
 def validate_preferences(raw_data: Dict) -> UserPreferences:
     """
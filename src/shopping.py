@@ -0,0 +1,278 @@
+"""Multi-store grocery basket optimization over cached store price tables."""
+
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .constants import PRICE_CACHE_DIR, PRICE_CACHE_TTL
+from .models import GroceryItem
+from .utils import normalize_search_text
+
+logger = logging.getLogger(__name__)
+
+PriceLoader = Callable[[], Dict]
+
+
+class BasketPlan(BaseModel):
+    """Model representing a grocery list split across stores."""
+    stores: Dict[str, List[str]] = Field(default={})
+    item_cost: float = Field(default=0.0)
+    delivery_cost: float = Field(default=0.0)
+    total_cost: float = Field(default=0.0)
+    unavailable: List[str] = Field(default=[])
+
+
+class StorePriceTable:
+    """
+    Item prices and delivery fees for several stores, held in indexed arrays.
+
+    Attributes:
+        stores (Tuple[str, ...]): Store names in column order.
+        items (Tuple[str, ...]): Normalized item names in row order.
+        prices (np.ndarray): (items x stores) unit prices, inf where unavailable.
+        delivery_fees (np.ndarray): Per-store delivery fee in column order.
+    """
+
+    def __init__(self, stores: Iterable[str], items: Iterable[str], prices: np.ndarray,
+                 delivery_fees: np.ndarray):
+        """
+        Initialize the table from prebuilt arrays.
+
+        Args:
+            stores (Iterable[str]): Store names in column order.
+            items (Iterable[str]): Normalized item names in row order.
+            prices (np.ndarray): (items x stores) unit prices, inf where unavailable.
+            delivery_fees (np.ndarray): Per-store delivery fee in column order.
+        """
+        self.stores = tuple(stores)
+        self.items = tuple(items)
+        self.prices = prices
+        self.delivery_fees = delivery_fees
+        self.item_index = {item: row for row, item in enumerate(self.items)}
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> "StorePriceTable":
+        """
+        Build a table from a raw price payload.
+
+        The payload has a "delivery_fees" mapping of store to fee and a "prices" list
+        of {"store", "item", "price"} records; an optional "available": false marks an
+        item as out of stock.
+
+        Args:
+            payload (Dict): The raw price payload.
+
+        Returns:
+            StorePriceTable: The indexed table.
+
+        Raises:
+            ValueError: If a price record references an unknown store.
+        """
+        fees = payload.get("delivery_fees", {})
+        stores = list(fees)
+        store_index = {store: column for column, store in enumerate(stores)}
+        item_index: Dict[str, int] = {}
+        entries = []
+        for record in payload.get("prices", []):
+            if record["store"] not in store_index:
+                raise ValueError(f"Unknown store in price table: {record['store']}")
+            if not record.get("available", True):
+                continue
+            item = normalize_search_text(record["item"])
+            row = item_index.setdefault(item, len(item_index))
+            entries.append((row, store_index[record["store"]], float(record["price"])))
+
+        prices = np.full((len(item_index), len(stores)), np.inf)
+        if entries:
+            rows, columns, values = zip(*entries)
+            prices[list(rows), list(columns)] = values
+        delivery_fees = np.array([float(fees[store]) for store in stores])
+        return cls(stores, item_index, prices, delivery_fees)
+
+
+class PriceTableCache:
+    """
+    Local cache of store price tables refreshed after a TTL.
+
+    Tables are kept in memory and, when a cache directory is configured, on disk so a
+    restarted worker can reuse a still-fresh payload without calling the loader. Each
+    source (e.g. a region or tenant) gets its own file, and the file records the
+    source that wrote it so caches never read another source's prices.
+    """
+
+    def __init__(self, source: str, loader: PriceLoader, ttl: int = PRICE_CACHE_TTL,
+                 cache_dir: Optional[Path] = PRICE_CACHE_DIR):
+        """
+        Initialize the cache.
+
+        Args:
+            source (str): Identifies the price source, e.g. a region or tenant.
+            loader (PriceLoader): Fetches the raw price payload from the stores.
+            ttl (int): Seconds a loaded payload stays fresh.
+            cache_dir (Optional[Path]): Directory to persist payloads in, or None.
+        """
+        self.source = source
+        self.loader = loader
+        self.ttl = ttl
+        self.cache_file = None
+        if cache_dir is not None:
+            file_name = re.sub(r"[^\w.-]+", "_", source)
+            self.cache_file = cache_dir / f"{file_name}.json"
+        self._table: Optional[StorePriceTable] = None
+        self._loaded_at = 0.0
+
+    def get(self) -> StorePriceTable:
+        """
+        Return a fresh price table, loading it if the cached one expired.
+
+        Returns:
+            StorePriceTable: The current price table.
+        """
+        now = time.time()
+        if self._table is not None and now - self._loaded_at < self.ttl:
+            return self._table
+
+        table, loaded_at = self._read_cached_table(now)
+        if table is None:
+            payload, loaded_at = self.loader(), now
+            self._write_cache_file(payload)
+            logger.info("Refreshed store price tables")
+            table = StorePriceTable.from_payload(payload)
+        self._table = table
+        self._loaded_at = loaded_at
+        return self._table
+
+    def invalidate(self) -> None:
+        """Drop the in-memory table so the next get reloads it."""
+        self._table = None
+
+    def _read_cached_table(self, now: float) -> Tuple[Optional[StorePriceTable], float]:
+        """Return the table built from a fresh persisted payload, if it is usable."""
+        payload, loaded_at = self._read_cache_file(now)
+        if payload is None:
+            return None, 0.0
+        try:
+            return StorePriceTable.from_payload(payload), loaded_at
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring malformed price cache %s: %s",
+                           self.cache_file, str(e))
+            return None, 0.0
+
+    def _read_cache_file(self, now: float) -> Tuple[Optional[Dict], float]:
+        """Return the persisted payload and its load time if it is still fresh."""
+        if self.cache_file is None or not self.cache_file.exists():
+            return None, 0.0
+        try:
+            cached = json.loads(self.cache_file.read_text())
+            source, payload = cached["source"], cached["payload"]
+            loaded_at = float(cached["loaded_at"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable price cache: %s", str(e))
+            return None, 0.0
+        if source != self.source or not isinstance(payload, dict):
+            logger.warning("Ignoring price cache %s not written for source %s",
+                           self.cache_file, self.source)
+            return None, 0.0
+        if now - loaded_at >= self.ttl:
+            return None, 0.0
+        return payload, loaded_at
+
+    def _write_cache_file(self, payload: Dict) -> None:
+        """Persist a freshly loaded payload."""
+        if self.cache_file is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cached = {"source": self.source, "loaded_at": time.time(),
+                      "payload": payload}
+            self.cache_file.write_text(json.dumps(cached))
+        except OSError as e:
+            logger.warning("Could not write price cache: %s", str(e))
+
+
+def _basket_lines(grocery_list: Iterable[Union[GroceryItem, Dict]]) -> Dict[str, float]:
+    """Return normalized item name to quantity for grocery list lines."""
+    lines: Dict[str, float] = {}
+    for line in grocery_list:
+        if isinstance(line, GroceryItem):
+            name, quantity = line.name, line.quantity
+        else:
+            # GroceryService lines describe one pack, e.g. "500g"
+            name, quantity = line["item"], 1.0
+        key = normalize_search_text(name)
+        lines[key] = lines.get(key, 0.0) + quantity
+    return lines
+
+
+def _basket_costs(costs: np.ndarray, fees: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """Return the total cost of buying every item at its cheapest store in each mask."""
+    masked = np.where(masks[:, None, :], costs[None, :, :], np.inf)
+    item_costs = masked.min(axis=2).sum(axis=1)
+    return item_costs + masks @ fees
+
+
+def optimize_basket(grocery_list: Iterable[Union[GroceryItem, Dict]],
+                    table: StorePriceTable, max_iterations: int = 100) -> BasketPlan:
+    """
+    Split a grocery list across stores to minimize item cost plus delivery fees.
+
+    Starts from buying every item at its cheapest store, then repeatedly applies the
+    best single store open/close move until no move lowers the total. Each round
+    evaluates all moves at once as (stores x items x stores) array operations, so the
+    search stays polynomial instead of enumerating store subsets.
+
+    Args:
+        grocery_list (Iterable[Union[GroceryItem, Dict]]): Lines from either grocery
+            list generator.
+        table (StorePriceTable): Prices and delivery fees to optimize over.
+        max_iterations (int): Upper bound on improvement rounds.
+
+    Returns:
+        BasketPlan: The chosen store for each item and the resulting costs.
+    """
+    lines = _basket_lines(grocery_list)
+    rows = []
+    names = []
+    unavailable = []
+    for name, quantity in lines.items():
+        row = table.item_index.get(name)
+        if row is None or not np.isfinite(table.prices[row]).any():
+            unavailable.append(name)
+            continue
+        rows.append(row)
+        names.append((name, quantity))
+    if not rows:
+        return BasketPlan(unavailable=unavailable)
+
+    quantities = np.array([quantity for _, quantity in names])
+    costs = table.prices[rows] * quantities[:, None]
+    fees = table.delivery_fees
+
+    open_stores = np.zeros(len(table.stores), dtype=bool)
+    open_stores[np.argmin(costs, axis=1)] = True
+    best = _basket_costs(costs, fees, open_stores[None, :])[0]
+
+    flips = np.eye(len(table.stores), dtype=bool)
+    for _ in range(max_iterations):
+        candidates = open_stores[None, :] ^ flips
+        totals = _basket_costs(costs, fees, candidates)
+        move = int(np.argmin(totals))
+        if not totals[move] < best:
+            break
+        open_stores, best = candidates[move], totals[move]
+
+    masked = np.where(open_stores[None, :], costs, np.inf)
+    choice = np.argmin(masked, axis=1)
+    stores: Dict[str, List[str]] = {}
+    for (name, _), column in zip(names, choice.tolist()):
+        stores.setdefault(table.stores[column], []).append(name)
+    item_cost = float(masked[np.arange(len(rows)), choice].sum())
+    delivery_cost = float(fees[np.unique(choice)].sum())
+    return BasketPlan(stores=stores, item_cost=item_cost, delivery_cost=delivery_cost,
+                      total_cost=item_cost + delivery_cost, unavailable=unavailable)
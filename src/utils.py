@@ -1,4 +1,5 @@
 import logging
+import sys
 from typing import Optional, Dict, List
 from pydantic import BaseModel
 import re
@@ -71,4 +72,22 @@ def format_ingredient(ingredient: str) -> Optional[str]:
         return ingredient
     except Exception as e:
         logger.error(f"Error formatting ingredient: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def normalize_search_text(text: str) -> str:
+    """
+    Normalize free text for case-insensitive matching.
+    
+    Uses clean_recipe_name so catalog names and search fields agree, then lowercases
+    and interns the result so repeated values share a single string object.
+    
+    Args:
+        text (str): The original text, e.g. a recipe name or cuisine.
+        
+    Returns:
+        str: The normalized, interned text, or an empty string if input is invalid.
+    """
+    cleaned = clean_recipe_name(text)
+    if cleaned is None:
+        return ""
+    return sys.intern(cleaned.lower())
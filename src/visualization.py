@@ -0,0 +1,361 @@
+"""Cached meal plan visualizations for the Streamlit dashboard."""
+
+import logging
+from collections import Counter
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from .models import MealPlan
+from .nutrition import NutrientAggregator
+from .services import GroceryService
+from .utils import normalize_search_text
+
+logger = logging.getLogger(__name__)
+
+NUTRIENT_CHART = "nutrients"
+CALENDAR_CHART = "calendar"
+CATEGORY_CHART = "categories"
+CHARTS = (NUTRIENT_CHART, CALENDAR_CHART, CATEGORY_CHART)
+UNCATEGORIZED = "Uncategorized"
+
+
+def _same_values(old: Optional[np.ndarray], new: Optional[np.ndarray]) -> bool:
+    """Return whether two optional total vectors hold the same values."""
+    if old is None or new is None:
+        return old is new
+    return np.array_equal(old, new)
+
+
+class PlanAggregateCache:
+    """
+    Incrementally maintained aggregates behind the dashboard charts.
+
+    Each plan's contribution (calorie/nutrient totals and grocery category counts) is
+    stored per date, so replacing one plan only subtracts its old contribution and
+    adds the new one. Every chart has its own version number, bumped only when the
+    data it draws actually changes.
+
+    Ingredients are counted under the category of the grocery catalog item with the
+    same name, or UNCATEGORIZED when the catalog has no such item.
+
+    Attributes:
+        aggregator (NutrientAggregator): Computes per-plan nutrient totals.
+        grocery_service (GroceryService): Catalog that categorizes ingredients.
+        chart_versions (Dict[str, int]): Current data version per chart.
+    """
+
+    def __init__(self, aggregator: Optional[NutrientAggregator] = None,
+                 grocery_service: Optional[GroceryService] = None):
+        """
+        Initialize an empty aggregate cache.
+
+        Args:
+            aggregator (Optional[NutrientAggregator]): Aggregator to use for totals.
+            grocery_service (Optional[GroceryService]): Catalog to categorize
+                ingredients with; defaults to the sample grocery catalog.
+        """
+        self.aggregator = aggregator or NutrientAggregator()
+        self.grocery_service = grocery_service or GroceryService()
+        self.chart_versions = {chart: 0 for chart in CHARTS}
+        self._plan_totals: Dict[str, np.ndarray] = {}
+        self._plan_ingredients: Dict[str, Counter] = {}
+        self._plan_categories: Dict[str, Counter] = {}
+        self._nutrient_sum = np.zeros(len(self.aggregator.columns))
+        self._category_counts: Counter = Counter()
+        self._catalog_version = None
+        self._item_categories: Dict[str, str] = {}
+
+    def update_plans(self, plans: Iterable[MealPlan]) -> Set[str]:
+        """
+        Add or replace plans, keyed by their date.
+
+        Args:
+            plans (Iterable[MealPlan]): The new or changed meal plans.
+
+        Returns:
+            Set[str]: The charts whose data changed.
+        """
+        plans = list(plans)
+        changed = self.refresh_categories()
+        if not plans:
+            return changed
+        totals = self.aggregator.plan_totals(plans)
+        for plan, plan_totals in zip(plans, totals):
+            ingredients = Counter(normalize_search_text(ingredient)
+                                  for meal in plan.meals
+                                  for ingredient in meal.ingredients)
+            changed |= self._apply(plan.date, plan_totals, ingredients)
+        return changed
+
+    def refresh_categories(self) -> Set[str]:
+        """
+        Re-categorize all plans if the grocery catalog was reloaded.
+
+        Returns:
+            Set[str]: The charts whose data changed.
+        """
+        version = self.grocery_service.version
+        if version == self._catalog_version:
+            return set()
+        self._catalog_version = version
+        self._item_categories = {
+            normalize_search_text(item["item"]): item.get("category") or UNCATEGORIZED
+            for item in self.grocery_service.grocery_items
+        }
+        plan_ingredients = self._plan_ingredients.items()
+        self._plan_categories = {date: self._categorize(ingredients)
+                                 for date, ingredients in plan_ingredients}
+        category_counts = +sum(self._plan_categories.values(), Counter())
+        if category_counts == self._category_counts:
+            return set()
+        self._category_counts = category_counts
+        self.chart_versions[CATEGORY_CHART] += 1
+        return {CATEGORY_CHART}
+
+    def _categorize(self, ingredients: Counter) -> Counter:
+        """Return ingredient counts summed per grocery catalog category."""
+        categories = Counter()
+        for ingredient, count in ingredients.items():
+            categories[self._item_categories.get(ingredient, UNCATEGORIZED)] += count
+        return categories
+
+    def remove_plan(self, date: str) -> Set[str]:
+        """
+        Remove the plan for a date.
+
+        Args:
+            date (str): The date of the plan to remove.
+
+        Returns:
+            Set[str]: The charts whose data changed.
+        """
+        if date not in self._plan_totals:
+            return set()
+        return self._apply(date, None, Counter())
+
+    def _apply(self, date: str, totals: Optional[np.ndarray],
+               ingredients: Counter) -> Set[str]:
+        """Swap one date's contribution and bump versions of affected charts."""
+        old_totals = self._plan_totals.pop(date, None)
+        self._plan_ingredients.pop(date, None)
+        old_categories = self._plan_categories.pop(date, Counter())
+        categories = self._categorize(ingredients)
+        changed = set()
+
+        if not _same_values(old_totals, totals):
+            changed.add(CALENDAR_CHART)
+            if old_totals is not None:
+                self._nutrient_sum -= old_totals
+            if totals is not None:
+                self._nutrient_sum += totals
+            old_nutrients = None if old_totals is None else old_totals[1:]
+            new_nutrients = None if totals is None else totals[1:]
+            if not _same_values(old_nutrients, new_nutrients):
+                changed.add(NUTRIENT_CHART)
+
+        if old_categories != categories:
+            self._category_counts.subtract(old_categories)
+            self._category_counts.update(categories)
+            self._category_counts = +self._category_counts
+            changed.add(CATEGORY_CHART)
+
+        if totals is not None:
+            self._plan_totals[date] = totals
+            self._plan_ingredients[date] = ingredients
+            self._plan_categories[date] = categories
+        for chart in changed:
+            self.chart_versions[chart] += 1
+        return changed
+
+    def nutrient_breakdown(self) -> Dict[str, float]:
+        """
+        Return nutrient totals across all plans.
+
+        Returns:
+            Dict[str, float]: Total per nutrient, in the aggregator's column order.
+        """
+        return dict(zip(self.aggregator.nutrients, self._nutrient_sum[1:].tolist()))
+
+    def calendar(self, metric: str = "calories") -> List[Tuple[str, float]]:
+        """
+        Return the per-date value of a metric.
+
+        Args:
+            metric (str): "calories" or one of the aggregator's nutrients.
+
+        Returns:
+            List[Tuple[str, float]]: (date, value) pairs sorted by date.
+
+        Raises:
+            ValueError: If the metric is unknown.
+        """
+        if metric not in self.aggregator.columns:
+            raise ValueError(f"Unknown metric: {metric}")
+        column = self.aggregator.columns.index(metric)
+        return [(date, float(self._plan_totals[date][column]))
+                for date in sorted(self._plan_totals)]
+
+    def category_counts(self) -> Dict[str, float]:
+        """
+        Return ingredient counts per grocery category across all plans.
+
+        Returns:
+            Dict[str, float]: Ingredient count per grocery category.
+        """
+        return dict(self._category_counts)
+
+
+class ChartRenderer:
+    """
+    Render charts onto reusable matplotlib figures.
+
+    A figure is redrawn only when the requested version differs from the version it
+    was last drawn at; otherwise the cached figure is returned unchanged.
+    """
+
+    def __init__(self):
+        """Initialize the renderer with no cached figures."""
+        self._figures: Dict[str, Tuple[object, Figure]] = {}
+        self.render_count = 0
+
+    def render(self, key: str, version: object,
+               draw: Callable[[Figure], None]) -> Figure:
+        """
+        Return the figure for a chart, redrawing it only if its version changed.
+
+        Args:
+            key (str): Identifies the chart.
+            version (object): Data version the figure must reflect.
+            draw (Callable[[Figure], None]): Draws the chart onto a cleared figure.
+
+        Returns:
+            Figure: The up-to-date figure.
+        """
+        cached = self._figures.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        figure = cached[1] if cached is not None else Figure(figsize=(6, 3))
+        figure.clear()
+        draw(figure)
+        self._figures[key] = (version, figure)
+        self.render_count += 1
+        logger.debug("Rendered chart %s at version %s", key, version)
+        return figure
+
+
+class PlanDashboard:
+    """
+    Nutrient, calendar and grocery category charts for a set of meal plans.
+
+    Attributes:
+        aggregates (PlanAggregateCache): Incrementally updated chart data.
+        renderer (ChartRenderer): Cache of rendered figures.
+    """
+
+    def __init__(self, plans: Iterable[MealPlan] = (),
+                 grocery_service: Optional[GroceryService] = None):
+        """
+        Initialize the dashboard.
+
+        Args:
+            plans (Iterable[MealPlan]): Initial meal plans.
+            grocery_service (Optional[GroceryService]): Catalog that categorizes
+                ingredients.
+        """
+        self.aggregates = PlanAggregateCache(grocery_service=grocery_service)
+        self.renderer = ChartRenderer()
+        self._plans: Dict[str, MealPlan] = {}
+        self.sync_plans(plans)
+
+    def sync_plans(self, plans: Iterable[MealPlan],
+                   changed: Collection[MealPlan] = ()) -> Set[str]:
+        """
+        Bring the dashboard in line with the current set of plans.
+
+        Plans are compared by identity, so a rerun that passes the same plan objects
+        re-aggregates nothing. Only new or replaced plans, and those listed in changed,
+        are re-aggregated, and dates no longer present are removed, so unaffected
+        charts keep their figures.
+
+        Args:
+            plans (Iterable[MealPlan]): All meal plans to show, one per date.
+            changed (Collection[MealPlan]): Plans that were edited in place since the
+                last sync.
+
+        Returns:
+            Set[str]: The charts whose data changed.
+        """
+        current = {plan.date: plan for plan in plans}
+        edited = {id(plan) for plan in changed}
+        changed_plans = [plan for date, plan in current.items()
+                         if self._plans.get(date) is not plan or id(plan) in edited]
+        changed_charts = self.aggregates.update_plans(changed_plans)
+        for date in set(self._plans) - set(current):
+            changed_charts |= self.aggregates.remove_plan(date)
+        self._plans = current
+        return changed_charts
+
+    def nutrient_figure(self) -> Figure:
+        """Return the nutrient breakdown bar chart."""
+        def draw(figure: Figure) -> None:
+            breakdown = self.aggregates.nutrient_breakdown()
+            axes = figure.add_subplot()
+            axes.bar(list(breakdown), list(breakdown.values()))
+            axes.set_title("Nutrient breakdown")
+
+        version = self.aggregates.chart_versions[NUTRIENT_CHART]
+        return self.renderer.render(NUTRIENT_CHART, version, draw)
+
+    def calendar_figure(self, metric: str = "calories") -> Figure:
+        """Return the per-date plan calendar for a metric."""
+        def draw(figure: Figure) -> None:
+            days = self.aggregates.calendar(metric)
+            axes = figure.add_subplot()
+            dates = [date for date, _ in days]
+            axes.plot(dates, [value for _, value in days], marker="o")
+            axes.set_title(f"Daily {metric}")
+            axes.tick_params(axis="x", labelrotation=45)
+
+        version = (self.aggregates.chart_versions[CALENDAR_CHART], metric)
+        return self.renderer.render(CALENDAR_CHART, version, draw)
+
+    def category_figure(self) -> Figure:
+        """Return the grocery category bar chart."""
+        def draw(figure: Figure) -> None:
+            counts = self.aggregates.category_counts()
+            axes = figure.add_subplot()
+            axes.barh(list(counts), list(counts.values()))
+            axes.set_title("Grocery categories")
+
+        version = self.aggregates.chart_versions[CATEGORY_CHART]
+        return self.renderer.render(CATEGORY_CHART, version, draw)
+
+
+def run_dashboard(plans: List[MealPlan], changed: Collection[MealPlan] = (),
+                  grocery_service: Optional[GroceryService] = None) -> None:
+    """
+    Render the meal plan dashboard with Streamlit.
+
+    The dashboard is kept in session state and synced with plans on every rerun, so
+    only changed plans are re-aggregated and only affected charts are redrawn.
+
+    Args:
+        plans (List[MealPlan]): The meal plans to visualize.
+        changed (Collection[MealPlan]): Plans edited in place since the last rerun.
+        grocery_service (Optional[GroceryService]): Catalog that categorizes
+            ingredients; only used when the dashboard is first created.
+    """
+    import streamlit as st
+
+    if "plan_dashboard" not in st.session_state:
+        st.session_state.plan_dashboard = PlanDashboard(grocery_service=grocery_service)
+    dashboard = st.session_state.plan_dashboard
+    dashboard.sync_plans(plans, changed=changed)
+
+    st.title("Meal plan overview")
+    metric = st.selectbox("Calendar metric", dashboard.aggregates.aggregator.columns)
+    st.pyplot(dashboard.calendar_figure(metric))
+    st.pyplot(dashboard.nutrient_figure())
+    st.pyplot(dashboard.category_figure())
@@ -0,0 +1,120 @@
+"""Tests for the sharded regional catalog."""
+
+import pytest
+
+from src.catalog import ShardedCatalog, partition_recipes
+from src.services import UserPreferences
+
+
+def recipe(name, cuisine):
+    return {"id": name, "name": name, "cuisine": cuisine, "calories": 300,
+            "protein": 20, "fat": 10}
+
+
+GROCERY_ITEMS = [{"item": "Salmon", "quantity": "1 kg", "category": "Salmon"},
+                 {"item": "Tofu", "quantity": "400g", "category": "Tofu"}]
+
+
+@pytest.fixture
+def catalog():
+    catalog = ShardedCatalog()
+    catalog.add_region("eu", [recipe("Salmon Bowl", "Nordic"),
+                              recipe("Tofu Curry", "Asian")], GROCERY_ITEMS)
+    catalog.add_region("us", [recipe("Tofu Tacos", "Mexican")], GROCERY_ITEMS)
+    return catalog
+
+
+def preferences(*cuisines):
+    return UserPreferences(dietary_restrictions=[], preferred_cuisines=list(cuisines),
+                           meal_types=["bowl", "curry", "tacos"], max_calories=500,
+                           min_protein=10, max_fat=20)
+
+
+def names(recipes):
+    return [recipe["name"] for recipe in recipes]
+
+
+def items(grocery_list, field="item"):
+    return [item[field] for item in grocery_list]
+
+
+class TestShardedCatalog:
+    def test_partition_recipes_by_cuisine(self):
+        partitions = partition_recipes([recipe("A", "Asian"), recipe("B", " asian"),
+                                        recipe("C", "Nordic")])
+        sizes = {cuisine: len(partition) for cuisine, partition in partitions.items()}
+        assert sizes == {"asian": 2, "nordic": 1}
+
+    def test_route_only_to_matching_shards(self, catalog):
+        shards = catalog.route("eu", preferences("asian"))
+        assert [(shard.region, shard.cuisine) for shard in shards] == [("eu", "asian")]
+        assert catalog.route("apac", preferences("asian")) == []
+
+    def test_find_matching_recipes_stays_in_region(self, catalog):
+        recipes = catalog.find_matching_recipes("eu", preferences("asian", "mexican"))
+        assert names(recipes) == ["Tofu Curry"]
+
+    def test_generate_grocery_list_uses_recipe_shard(self, catalog):
+        recipes = catalog.find_matching_recipes("eu", preferences("asian", "nordic"))
+        assert items(catalog.generate_grocery_list("eu", recipes)) == ["Salmon", "Tofu"]
+
+    def test_grocery_list_for_unknown_region(self, catalog):
+        recipes = [recipe("Tofu Curry", "Asian")]
+        assert catalog.generate_grocery_list("apac", recipes) == []
+
+    def test_add_region_unloads_missing_cuisines(self, catalog):
+        catalog.add_region("eu", [recipe("Tofu Curry", "Asian")], GROCERY_ITEMS)
+        assert catalog.shard_keys() == [("eu", "asian"), ("us", "mexican")]
+
+    def test_region_shards_share_grocery_catalog(self, catalog):
+        catalog.add_shard("eu", "Asian", [recipe("Tofu Curry", "Asian")],
+                          [{"item": "Tofu", "quantity": "1 kg", "category": "Tofu"}])
+        recipes = catalog.find_matching_recipes("eu", preferences("asian", "nordic"))
+        grocery_list = catalog.generate_grocery_list("eu", recipes)
+        assert items(grocery_list, "quantity") == ["1 kg"]
+
+    def test_load_and_unload_shard(self):
+        calls = []
+
+        def loader(region, cuisine):
+            calls.append((region, cuisine))
+            return [recipe("Tofu Curry", cuisine)], GROCERY_ITEMS
+
+        catalog = ShardedCatalog(loader)
+        catalog.load_shard("eu", "Asian")
+        catalog.load_shard("eu", "Asian")
+        assert calls == [("eu", "Asian"), ("eu", "Asian")]
+        assert catalog.shard_keys() == [("eu", "asian")]
+        catalog.unload_shard("eu", "Asian")
+        assert catalog.shard_keys() == []
+
+    def test_shard_rejects_recipes_of_other_cuisines(self):
+        catalog = ShardedCatalog(
+            lambda region, cuisine: ([recipe("Green Curry", "Thai")], GROCERY_ITEMS))
+        with pytest.raises(ValueError):
+            catalog.load_shard("eu", "asian")
+        assert catalog.shard_keys() == []
+
+    def test_load_shard_without_loader(self, catalog):
+        with pytest.raises(ValueError):
+            catalog.load_shard("eu", "asian")
+
+    def test_reloading_shard_publishes_new_services_together(self, catalog):
+        shard = catalog.route("eu", preferences("asian"))[0]
+        grocery = catalog._regions["eu"].grocery_service
+        catalog.add_shard("eu", "Asian", [recipe("Tofu Bowl", "Asian")],
+                          GROCERY_ITEMS[1:])
+        state = catalog._regions["eu"]
+        assert state.shards["asian"] is not shard
+        assert state.grocery_service is not grocery
+        recipes = catalog.find_matching_recipes("eu", preferences("asian"))
+        assert names(recipes) == ["Tofu Bowl"]
+        # Queries holding the previous shard and grocery catalog finish on them
+        assert names(shard.recipe_service.recipes) == ["Tofu Curry"]
+        assert len(grocery.grocery_items) == 2
+
+    def test_reloading_shard_without_grocery_items_keeps_catalog(self, catalog):
+        grocery = catalog._regions["eu"].grocery_service
+        catalog.add_shard("eu", "Asian", [recipe("Tofu Bowl", "Asian")])
+        assert catalog._regions["eu"].grocery_service is grocery
+        assert catalog.shard_keys()[:2] == [("eu", "nordic"), ("eu", "asian")]
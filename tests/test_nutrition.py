@@ -0,0 +1,107 @@
+"""Tests for vectorized nutrient aggregation."""
+
+import numpy as np
+import pytest
+
+from src.models import Meal, MealPlan
+from src.nutrition import NutrientAggregator, summarize_plans
+
+
+def make_plan(date, *meals):
+    return MealPlan(date=date, meals=[
+        Meal(name=name, description=name, calories=calories, nutrients=nutrients)
+        for name, calories, nutrients in meals
+    ])
+
+
+@pytest.fixture
+def aggregator():
+    return NutrientAggregator(nutrients=("protein", "fat"))
+
+
+@pytest.fixture
+def plans():
+    return [
+        make_plan("2026-01-05", ("Oats", 300, {"protein": 10.0}),
+                  ("Salmon", 400, {"protein": 35.0, "fat": 15.0})),
+        make_plan("2026-01-06"),
+        make_plan("2026-01-06", ("Salad", None, {"fat": 12.0, "fiber": 4.0})),
+    ]
+
+
+class TestNutrientAggregator:
+    def test_meal_matrix_uses_fixed_column_order(self, aggregator, plans):
+        matrix, plan_ids = aggregator.meal_matrix(plans)
+        assert aggregator.columns == ("calories", "protein", "fat")
+        np.testing.assert_array_equal(matrix, [[300, 10, 0], [400, 35, 15], [0, 0, 12]])
+        np.testing.assert_array_equal(plan_ids, [0, 0, 2])
+
+    def test_plan_totals_handles_empty_plans(self, aggregator, plans):
+        totals = aggregator.plan_totals(plans)
+        np.testing.assert_array_equal(totals, [[700, 45, 15], [0, 0, 0], [0, 0, 12]])
+
+    def test_meal_matrix_logs_unknown_nutrients(self, aggregator, plans, caplog):
+        aggregator.meal_matrix(plans)
+        assert "['fiber']" in caplog.text
+
+    def test_fill_plans_sets_model_fields(self, aggregator, plans):
+        aggregator.fill_plans(plans[:2])
+        assert plans[0].total_calories == 700
+        assert plans[0].nutrients == {"protein": 45.0, "fat": 15.0}
+        assert plans[1].total_calories == 0
+        assert plans[1].nutrients == {}
+
+    def test_fill_plans_rejects_unknown_nutrients(self, aggregator, plans):
+        with pytest.raises(ValueError):
+            aggregator.fill_plans(plans)
+        assert plans[0].total_calories is None
+
+    def test_from_plans_covers_every_nutrient(self, plans):
+        tea = make_plan("2026-01-07", ("Tea", 5, {"iron": 1.0}))
+        aggregator = NutrientAggregator.from_plans([tea])
+        assert aggregator.nutrients[-1] == "iron"
+        aggregator.fill_plans(plans)
+        assert plans[2].nutrients == {"fat": 12.0, "fiber": 4.0}
+
+    def test_rollup_by_user_and_day(self, aggregator, plans):
+        frame = aggregator.to_frame(plans, user_ids=["u1", "u1", "u2"])
+        daily = aggregator.rollup(frame, freq="D")
+        assert daily.loc[("u1", "2026-01-05"), "calories"] == 700
+        assert daily.loc[("u2", "2026-01-06"), "fat"] == 12
+
+    def test_rollup_keeps_plans_without_user_ids(self, aggregator, plans):
+        frame = aggregator.to_frame(plans, user_ids=["u1", None, None])
+        daily = aggregator.rollup(frame, freq="D")
+        assert daily["calories"].sum() == 700
+        assert daily["fat"].sum() == 27
+        assert daily.index.get_level_values("user_id").isna().sum() == 1
+
+    def test_rollup_mean(self, aggregator, plans):
+        frame = aggregator.to_frame(plans)
+        daily = aggregator.rollup(frame, freq="D", by_user=False, how="mean")
+        assert daily.loc["2026-01-06", "fat"] == 6
+
+    def test_rollup_without_user_ids(self, aggregator, plans):
+        frame = aggregator.to_frame(plans)
+        assert aggregator.rollup(frame)["calories"].sum() == 700
+        with pytest.raises(ValueError):
+            aggregator.rollup(frame, by_user=True)
+
+    def test_target_deviation(self, aggregator, plans):
+        frame = aggregator.to_frame(plans)
+        deviation = aggregator.target_deviation(frame, {"calories": 500})
+        assert list(deviation["calories"]) == [200, -500, -500]
+
+    def test_invalid_inputs_raise(self, aggregator, plans):
+        with pytest.raises(ValueError):
+            aggregator.to_frame(plans, user_ids=["u1"])
+        with pytest.raises(ValueError):
+            aggregator.rollup(aggregator.to_frame(plans), how="median")
+        with pytest.raises(ValueError):
+            aggregator.target_deviation(aggregator.to_frame(plans), {"iron": 10})
+
+
+def test_summarize_plans_weekly(plans):
+    weekly = summarize_plans(plans, user_ids=["u1", "u1", "u1"])
+    assert weekly["calories"].sum() == 700
+    assert plans[2].nutrients == {"fat": 12.0, "fiber": 4.0}
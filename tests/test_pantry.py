@@ -0,0 +1,76 @@
+"""Tests for pantry-aware grocery list syncing."""
+
+import pytest
+
+from src.models import GroceryItem
+from src.pantry import GrocerySync, PantryStore, to_grocery_items
+
+
+def quantities(items):
+    return {item.name: item.quantity for item in items}
+
+
+@pytest.fixture
+def pantry():
+    store = PantryStore()
+    store.set_stock("h1", "rice", 2.0)
+    store.set_stock("h1", "Eggs", 6.0)
+    return store
+
+
+@pytest.fixture
+def grocery_list():
+    return [GroceryItem(name="Rice", quantity=3.0),
+            GroceryItem(name="eggs", quantity=4.0),
+            GroceryItem(name="Milk", quantity=1.0)]
+
+
+class TestPantryStore:
+    def test_needs_subtracts_stock(self, pantry, grocery_list):
+        needed = pantry.needs("h1", grocery_list)
+        assert quantities(needed) == {"Rice": 1.0, "Milk": 1.0}
+
+    def test_needs_does_not_mutate_input(self, pantry, grocery_list):
+        pantry.needs("h1", grocery_list)
+        assert grocery_list[0].quantity == 3.0
+
+    def test_unknown_household_needs_everything(self, pantry, grocery_list):
+        assert len(pantry.needs("h2", grocery_list)) == 3
+
+    def test_set_stock_zero_removes_item(self, pantry):
+        pantry.set_stock("h1", "rice", 0)
+        assert pantry.quantity("h1", "Rice") == 0.0
+
+    def test_negative_stock_raises(self, pantry):
+        with pytest.raises(ValueError):
+            pantry.set_stock("h1", "rice", -1)
+
+    def test_grocery_service_lines_are_converted(self):
+        line = {"item": "Quinoa", "quantity": "500g", "category": "Grains"}
+        items = to_grocery_items([line] * 2)
+        assert [(item.name, item.quantity, item.unit) for item in items] == [
+            ("Quinoa", 2.0, "500g"),
+        ]
+
+
+class TestGrocerySync:
+    def test_first_diff_adds_everything(self, pantry, grocery_list):
+        delta = GrocerySync(pantry).diff("h1", grocery_list)
+        assert quantities(delta.added) == {"Rice": 1.0, "Milk": 1.0}
+        assert not delta.removed and not delta.changed
+
+    def test_replan_sends_only_changes(self, pantry, grocery_list):
+        sync = GrocerySync(pantry)
+        sync.mark_synced("h1", sync.diff("h1", grocery_list))
+
+        replan = [GroceryItem(name="Rice", quantity=5.0),
+                  GroceryItem(name="Eggs", quantity=4.0),
+                  GroceryItem(name="Bread", quantity=1.0)]
+        delta = sync.diff("h1", replan)
+        assert quantities(delta.added) == {"Bread": 1.0}
+        assert quantities(delta.changed) == {"Rice": 3.0}
+        assert quantities(delta.removed) == {"Milk": 1.0}
+
+        sync.mark_synced("h1", delta)
+        assert quantities(sync.synced_list("h1")) == {"Rice": 3.0, "Bread": 1.0}
+        assert sync.diff("h1", replan).is_empty
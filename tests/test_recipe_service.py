@@ -0,0 +1,239 @@
+"""Tests for the recipe and grocery service layer."""
+
+import json
+
+import pytest
+
+from src.services import RecipeService, GroceryService, UserPreferences
+from src.utils import normalize_search_text
+
+
+def make_salads(count, cuisine):
+    return [{"id": str(i), "name": f"salad {i}", "cuisine": cuisine, "calories": 100,
+             "protein": 20, "fat": 5} for i in range(count)]
+
+
+class CountingRecords(tuple):
+    """Snapshot records that count how many entries a scan reads."""
+
+    def __init__(self, records):
+        self.reads = 0
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+
+@pytest.fixture
+def recipe_service():
+    return RecipeService()
+
+
+@pytest.fixture
+def preferences():
+    return UserPreferences(
+        dietary_restrictions=[],
+        preferred_cuisines=["asian", "western", "mediterranean"],
+        meal_types=["salmon", "stir fry", "salad"],
+        max_calories=500,
+        min_protein=10,
+        max_fat=20,
+    )
+
+
+class TestNormalizedFields:
+    def test_normalize_search_text_strips_and_lowercases(self):
+        assert normalize_search_text("  Grilled SALMON ") == "grilled salmon"
+
+    def test_normalize_search_text_invalid_input(self):
+        assert normalize_search_text(None) == ""
+
+    def test_normalize_search_text_is_interned(self):
+        interned = normalize_search_text("Quinoa Salad")
+        assert interned is normalize_search_text("quinoa salad ")
+
+    def test_recipes_carry_normalized_fields(self, recipe_service):
+        recipe = recipe_service.recipes[0]
+        assert recipe["normalized_name"] == "grilled salmon"
+        assert recipe["normalized_cuisine"] == "western"
+
+    def test_index_fields_stay_out_of_results(self, recipe_service, preferences):
+        recipe = recipe_service.find_matching_recipes(preferences)[0]
+        assert "normalized_name" not in recipe and "normalized_cuisine" not in recipe
+        line = next(recipe_service.stream_matching_recipes(preferences))
+        assert "normalized_name" not in json.loads(line)
+        item = GroceryService().generate_grocery_list([{"name": "Protein Bowl"}])[0]
+        assert "normalized_category" not in item
+
+    def test_grocery_items_carry_normalized_fields(self):
+        item = GroceryService().grocery_items[0]
+        assert item["normalized_category"] == "protein"
+
+
+class TestRecipeMatching:
+    def test_find_matching_recipes(self, recipe_service, preferences):
+        names = [r["name"] for r in recipe_service.find_matching_recipes(preferences)]
+        assert names == ["Grilled Salmon", "Vegetable Stir Fry", "Quinoa Salad"]
+
+    def test_find_matching_recipes_excludes_restricted(self, recipe_service,
+                                                       preferences):
+        data = preferences.dict()
+        data["dietary_restrictions"] = [{"restriction": "salmon", "severity": 1}]
+        matches = recipe_service.find_matching_recipes(UserPreferences(**data))
+        names = [r["name"] for r in matches]
+        assert "Grilled Salmon" not in names
+
+    def test_generate_grocery_list_accepts_unindexed_recipes(self):
+        service = GroceryService()
+        grocery_list = service.generate_grocery_list([{"name": "Protein Bowl"}])
+        assert [item["item"] for item in grocery_list] == ["Salmon"]
+
+
+class TestLazyResults:
+    def test_iter_matching_recipes_stops_at_limit(self, preferences, monkeypatch):
+        service = RecipeService(make_salads(10, "Western"))
+        records = CountingRecords(service.recipes)
+        monkeypatch.setattr(RecipeService, "recipes", property(lambda self: records))
+        names = [r["name"] for r in service.iter_matching_recipes(preferences, limit=2)]
+        assert names == ["salad 0", "salad 1"]
+        assert records.reads == 2
+
+    def test_page_matching_recipes_resumes_from_cursor(self, recipe_service,
+                                                       preferences):
+        first = recipe_service.page_matching_recipes(preferences, limit=2)
+        assert len(first["items"]) == 2
+        assert first["next_cursor"] == "1:2"
+        second = recipe_service.page_matching_recipes(
+            preferences, cursor=first["next_cursor"], limit=2)
+        assert [r["name"] for r in second["items"]] == ["Quinoa Salad"]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.parametrize("cursor, limit",
+                             [("abc", 20), ("2", 20), ("1:-1", 20), (None, 0)])
+    def test_page_matching_recipes_rejects_invalid_requests(self, recipe_service,
+                                                            preferences, cursor, limit):
+        with pytest.raises(ValueError):
+            recipe_service.page_matching_recipes(preferences, cursor=cursor,
+                                                 limit=limit)
+
+    def test_stream_matching_recipes_emits_ndjson(self, recipe_service, preferences):
+        lines = list(recipe_service.stream_matching_recipes(preferences, limit=1))
+        assert all(line.endswith("\n") for line in lines)
+        assert json.loads(lines[0])["name"] == "Grilled Salmon"
+        assert json.loads(lines[-1]) == {"next_cursor": "1:1"}
+
+    def test_iter_grocery_list_consumes_recipe_generator(self, recipe_service,
+                                                         preferences):
+        grocery = GroceryService([
+            {"item": "Salmon", "quantity": "1 kg", "category": "Salmon"},
+            {"item": "Noodles", "quantity": "500g", "category": "Stir Fry"},
+        ])
+        consumed = []
+
+        def recipes():
+            for recipe in recipe_service.iter_matching_recipes(preferences):
+                consumed.append(recipe["name"])
+                yield recipe
+
+        items = list(grocery.iter_grocery_list(recipes(), limit=1))
+        assert [item["item"] for item in items] == ["Salmon"]
+        assert consumed == ["Grilled Salmon"]
+        matches = recipe_service.find_matching_recipes(preferences)
+        full = grocery.generate_grocery_list(matches)
+        assert [item["item"] for item in full] == ["Salmon", "Noodles"]
+
+
+class TestHotReload:
+    def test_reload_swaps_version(self, recipe_service, preferences):
+        assert recipe_service.version == 1
+        version = recipe_service.reload([
+            {"id": "1", "name": "Salmon Salad", "cuisine": "Nordic", "calories": 300,
+             "protein": 30, "fat": 10},
+        ])
+        assert version == recipe_service.version == 2
+        assert recipe_service.recipes[0]["normalized_cuisine"] == "nordic"
+
+    def test_reload_does_not_mutate_caller_records(self, recipe_service):
+        records = make_salads(1, "Asian")
+        recipe_service.reload(records)
+        assert "normalized_name" not in records[0]
+
+    def test_in_flight_scan_finishes_on_old_snapshot(self, recipe_service, preferences):
+        scan = recipe_service.iter_matching_recipes(preferences)
+        assert next(scan)["name"] == "Grilled Salmon"
+        recipe_service.reload([])
+        assert [r["name"] for r in scan] == ["Vegetable Stir Fry", "Quinoa Salad"]
+
+    def test_result_cache_is_keyed_by_version(self, recipe_service, preferences,
+                                              monkeypatch):
+        scans = []
+        scan = recipe_service._scan_matching_recipes
+
+        def counting_scan(*args, **kwargs):
+            scans.append(1)
+            return scan(*args, **kwargs)
+
+        monkeypatch.setattr(recipe_service, "_scan_matching_recipes", counting_scan)
+        first = recipe_service.find_matching_recipes(preferences)
+        assert recipe_service.find_matching_recipes(preferences) == first
+        assert len(scans) == 1
+
+        reload = recipe_service.reload_in_background(list(recipe_service.recipes[:1]))
+        reload.result(timeout=5)
+        names = [r["name"] for r in recipe_service.find_matching_recipes(preferences)]
+        assert names == ["Grilled Salmon"]
+        assert len(scans) == 2
+        assert (1, preferences.json()) in recipe_service._result_cache
+
+    def test_grocery_reload(self):
+        service = GroceryService()
+        service.reload([{"item": "Tofu", "quantity": "400g", "category": "Tofu"}])
+        assert service.version == 2
+        grocery_list = service.generate_grocery_list([{"name": "Tofu Curry"}])
+        assert [item["item"] for item in grocery_list] == ["Tofu"]
+
+    def test_returned_records_cannot_change_snapshot(self, recipe_service, preferences):
+        recipe_service.find_matching_recipes(preferences)[0]["calories"] = 999
+        assert recipe_service.find_matching_recipes(preferences)[0]["calories"] == 400
+        with pytest.raises(TypeError):
+            recipe_service.recipes[0]["calories"] = 999
+
+    def test_pagination_stays_on_its_version_across_reload(self):
+        salads = make_salads(6, "Greek")
+        service = RecipeService(salads)
+        prefs = UserPreferences(dietary_restrictions=[], preferred_cuisines=["greek"],
+                                meal_types=["salad"], max_calories=500, min_protein=10,
+                                max_fat=20)
+        first = service.page_matching_recipes(prefs, limit=3)
+        service.reload([dict(salads[0], id="new", name="salad new")] + salads)
+        second = service.page_matching_recipes(prefs, cursor=first["next_cursor"],
+                                               limit=3)
+        names = [r["name"] for r in first["items"] + second["items"]]
+        assert names == [f"salad {i}" for i in range(6)]
+
+    def test_cursor_for_evicted_version_is_rejected(self, recipe_service, preferences):
+        first = recipe_service.page_matching_recipes(preferences, limit=1)
+        cursor = first["next_cursor"]
+        for _ in range(3):
+            recipe_service.reload(list(recipe_service.recipes))
+        with pytest.raises(ValueError):
+            recipe_service.page_matching_recipes(preferences, cursor=cursor)
+
+
+class TestRecipeLookup:
+    def test_lookup_returns_snapshot_record(self, recipe_service, preferences):
+        recipe = recipe_service.find_matching_recipes(preferences)[0]
+        assert recipe_service.lookup(recipe)["normalized_name"] == "grilled salmon"
+        assert recipe_service.lookup(dict(recipe, name="Other")) is None
+
+    def test_grocery_list_reuses_precomputed_names(self, recipe_service, preferences,
+                                                   monkeypatch):
+        grocery = GroceryService(
+            [{"item": "Salmon", "quantity": "1 kg", "category": "Salmon"}],
+            recipe_lookup=recipe_service.lookup,
+        )
+        recipes = recipe_service.find_matching_recipes(preferences)
+        monkeypatch.setattr("src.services.normalize_search_text",
+                            lambda text: pytest.fail("re-normalized"))
+        grocery_list = grocery.generate_grocery_list(recipes)
+        assert [item["item"] for item in grocery_list] == ["Salmon"]
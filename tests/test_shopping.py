@@ -0,0 +1,115 @@
+"""Tests for the multi-store grocery basket optimizer."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from src.models import GroceryItem
+from src.shopping import PriceTableCache, StorePriceTable, optimize_basket
+
+
+@pytest.fixture
+def payload():
+    return {
+        "delivery_fees": {"FreshMart": 5.0, "BudgetFoods": 5.0, "Corner": 1.0},
+        "prices": [
+            {"store": "FreshMart", "item": "Salmon", "price": 10.0},
+            {"store": "FreshMart", "item": "Quinoa", "price": 4.0},
+            {"store": "BudgetFoods", "item": "Salmon", "price": 9.5},
+            {"store": "BudgetFoods", "item": "Quinoa", "price": 3.0},
+            {"store": "Corner", "item": "Quinoa", "price": 3.5, "available": False},
+        ],
+    }
+
+
+class TestStorePriceTable:
+    def test_from_payload_indexes_prices(self, payload):
+        table = StorePriceTable.from_payload(payload)
+        assert table.stores == ("FreshMart", "BudgetFoods", "Corner")
+        assert table.prices[table.item_index["quinoa"]].tolist() == [4.0, 3.0, np.inf]
+
+    def test_unknown_store_raises(self, payload):
+        payload["prices"].append({"store": "Nowhere", "item": "Salmon", "price": 1.0})
+        with pytest.raises(ValueError):
+            StorePriceTable.from_payload(payload)
+
+
+class TestOptimizeBasket:
+    def test_consolidates_when_delivery_fee_outweighs_savings(self, payload):
+        table = StorePriceTable.from_payload(payload)
+        grocery_list = [GroceryItem(name="Salmon", quantity=1), {"item": "Quinoa"},
+                        GroceryItem(name="Saffron", quantity=1)]
+        plan = optimize_basket(grocery_list, table)
+        assert plan.stores == {"BudgetFoods": ["salmon", "quinoa"]}
+        assert plan.total_cost == pytest.approx(17.5)
+        assert plan.unavailable == ["saffron"]
+
+    def test_matches_exhaustive_search_on_random_tables(self):
+        rng = np.random.default_rng(7)
+        stores = [f"store{i}" for i in range(6)]
+        prices = rng.uniform(1, 10, size=(30, 6))
+        prices[rng.random(prices.shape) < 0.3] = np.inf
+        prices[:, 0] = rng.uniform(1, 10, size=30)
+        fees = rng.uniform(0, 8, size=6)
+        table = StorePriceTable(stores, [f"item {i}" for i in range(30)], prices, fees)
+        grocery_list = [GroceryItem(name=item, quantity=1) for item in table.items]
+
+        plan = optimize_basket(grocery_list, table)
+        best = min(
+            prices[:, list(subset)].min(axis=1).sum() + fees[list(subset)].sum()
+            for size in range(1, 7) for subset in itertools.combinations(range(6), size)
+        )
+        assert plan.total_cost <= best * 1.05
+
+    def test_empty_list(self, payload):
+        plan = optimize_basket([], StorePriceTable.from_payload(payload))
+        assert plan.total_cost == 0.0
+
+
+class TestPriceTableCache:
+    def test_reuses_table_within_ttl(self, payload, tmp_path):
+        calls = []
+        cache = PriceTableCache("eu", lambda: calls.append(1) or payload, ttl=60,
+                                cache_dir=tmp_path)
+        assert cache.get() is cache.get()
+        assert len(calls) == 1
+
+    def test_restarted_cache_reads_fresh_file(self, payload, tmp_path):
+        PriceTableCache("eu", lambda: payload, ttl=60, cache_dir=tmp_path).get()
+        cache = PriceTableCache("eu", lambda: pytest.fail("loader called"), ttl=60,
+                                cache_dir=tmp_path)
+        assert cache.get().stores == ("FreshMart", "BudgetFoods", "Corner")
+
+    def test_sources_do_not_share_prices(self, payload, tmp_path):
+        other = {"delivery_fees": {"StoreB": 1.0}, "prices": []}
+        PriceTableCache("eu", lambda: payload, ttl=60, cache_dir=tmp_path).get()
+        cache = PriceTableCache("us", lambda: other, ttl=60, cache_dir=tmp_path)
+        assert cache.get().stores == ("StoreB",)
+
+    def test_ignores_file_written_for_another_source(self, payload, tmp_path):
+        other = {"delivery_fees": {"StoreB": 1.0}, "prices": []}
+        PriceTableCache("eu", lambda: payload, ttl=60, cache_dir=tmp_path).get()
+        (tmp_path / "eu.json").rename(tmp_path / "us.json")
+        cache = PriceTableCache("us", lambda: other, ttl=60, cache_dir=tmp_path)
+        assert cache.get().stores == ("StoreB",)
+
+    @pytest.mark.parametrize("content", [
+        "[1, 2]", "{}", '{"source": "eu", "loaded_at": "x"}', "not json",
+        '{"source": "eu", "loaded_at": 4102444800, '
+        '"payload": {"prices": [{"x": 1}]}}',
+        '{"source": "eu", "loaded_at": 4102444800, '
+        '"payload": {"delivery_fees": {"A": "free"}}}',
+    ])
+    def test_malformed_file_falls_back_to_loader(self, payload, tmp_path, content):
+        (tmp_path / "eu.json").write_text(content)
+        cache = PriceTableCache("eu", lambda: payload, ttl=60, cache_dir=tmp_path)
+        assert cache.get().stores == ("FreshMart", "BudgetFoods", "Corner")
+
+    def test_refreshes_after_ttl(self, payload):
+        calls = []
+        cache = PriceTableCache("eu", lambda: calls.append(1) or payload, ttl=0,
+                                cache_dir=None)
+        cache.get()
+        cache.get()
+        assert len(calls) == 2
@@ -0,0 +1,105 @@
+"""Tests for cached meal plan visualizations."""
+
+import pytest
+
+from src.models import Meal, MealPlan
+from src.services import GroceryService
+from src.visualization import (
+    CALENDAR_CHART, CATEGORY_CHART, CHARTS, NUTRIENT_CHART, UNCATEGORIZED,
+    PlanAggregateCache, PlanDashboard,
+)
+
+
+def make_plan(date, calories, protein, ingredients=("Quinoa", "salmon")):
+    meal = Meal(name="Bowl", description="Bowl", ingredients=list(ingredients),
+                calories=calories, nutrients={"protein": protein})
+    return MealPlan(date=date, meals=[meal])
+
+
+@pytest.fixture
+def plans():
+    return [make_plan("2026-01-05", 500, 20.0), make_plan("2026-01-06", 600, 30.0)]
+
+
+class TestPlanAggregateCache:
+    def test_aggregates_across_plans(self, plans):
+        cache = PlanAggregateCache()
+        cache.update_plans(plans)
+        assert cache.nutrient_breakdown()["protein"] == 50.0
+        assert cache.calendar() == [("2026-01-05", 500.0), ("2026-01-06", 600.0)]
+        assert cache.category_counts() == {"Grains": 2.0, "Protein": 2.0}
+
+    def test_update_bumps_only_affected_charts(self, plans):
+        cache = PlanAggregateCache()
+        cache.update_plans(plans)
+        versions = dict(cache.chart_versions)
+        changed = cache.update_plans([make_plan("2026-01-06", 650, 30.0)])
+        assert changed == {CALENDAR_CHART}
+        assert cache.chart_versions[NUTRIENT_CHART] == versions[NUTRIENT_CHART]
+        assert cache.chart_versions[CATEGORY_CHART] == versions[CATEGORY_CHART]
+        assert cache.calendar()[1] == ("2026-01-06", 650.0)
+
+    def test_remove_plan(self, plans):
+        cache = PlanAggregateCache()
+        cache.update_plans(plans)
+        assert cache.remove_plan("2026-01-05") == set(CHARTS)
+        assert cache.nutrient_breakdown()["protein"] == 30.0
+        assert cache.category_counts() == {"Grains": 1.0, "Protein": 1.0}
+        assert cache.remove_plan("2026-01-05") == set()
+
+    def test_unknown_ingredients_are_uncategorized(self):
+        cache = PlanAggregateCache()
+        cache.update_plans([make_plan("2026-01-05", 500, 20.0, ingredients=("Rice",))])
+        assert cache.category_counts() == {UNCATEGORIZED: 1.0}
+
+    def test_catalog_reload_recategorizes_plans(self, plans):
+        grocery = GroceryService()
+        cache = PlanAggregateCache(grocery_service=grocery)
+        cache.update_plans(plans)
+        grocery.reload([{"item": "Salmon", "quantity": "1 kg", "category": "Fish"}])
+        assert cache.refresh_categories() == {CATEGORY_CHART}
+        assert cache.category_counts() == {"Fish": 2.0, UNCATEGORIZED: 2.0}
+        assert cache.refresh_categories() == set()
+
+    def test_unknown_metric(self, plans):
+        with pytest.raises(ValueError):
+            PlanAggregateCache().calendar("iron")
+
+
+class TestPlanDashboard:
+    def test_figures_are_reused_until_data_changes(self, plans):
+        dashboard = PlanDashboard(plans)
+        nutrient_figure = dashboard.nutrient_figure()
+        calendar_figure = dashboard.calendar_figure()
+        assert dashboard.renderer.render_count == 2
+
+        assert dashboard.nutrient_figure() is nutrient_figure
+        assert dashboard.renderer.render_count == 2
+
+        dashboard.aggregates.update_plans([make_plan("2026-01-06", 650, 30.0)])
+        assert dashboard.nutrient_figure() is nutrient_figure
+        assert dashboard.calendar_figure() is calendar_figure
+        assert dashboard.renderer.render_count == 3
+
+    def test_calendar_metric_change_rerenders(self, plans):
+        dashboard = PlanDashboard(plans)
+        dashboard.calendar_figure()
+        dashboard.calendar_figure("protein")
+        assert dashboard.renderer.render_count == 2
+
+    def test_sync_plans_applies_only_changes(self, plans):
+        dashboard = PlanDashboard(plans)
+        assert dashboard.sync_plans(plans) == set()
+
+        edited = [plans[0], make_plan("2026-01-06", 650, 30.0)]
+        assert dashboard.sync_plans(edited) == {CALENDAR_CHART}
+
+        assert dashboard.sync_plans(edited[:1]) == set(CHARTS)
+        assert dashboard.aggregates.calendar() == [("2026-01-05", 500.0)]
+
+    def test_sync_plans_reaggregates_plans_edited_in_place(self, plans):
+        dashboard = PlanDashboard(plans)
+        plans[0].meals[0].calories = 550
+        assert dashboard.sync_plans(plans) == set()
+        assert dashboard.sync_plans(plans, changed=[plans[0]]) == {CALENDAR_CHART}
+        assert dashboard.aggregates.calendar()[0] == ("2026-01-05", 550.0)